@@ -1,19 +1,45 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from typing import List, Optional, Dict, Union
+from fastapi.routing import APIRoute
+from datetime import date
+from typing import AsyncIterator, List, Optional, Dict, Union
 from app.services.youtube_service import YouTubeService
 from app.services.ads_service import GoogleAdsService
-from app.services.unlisted_ads import UnlistedVideoFinder
+from app.services.unlisted_ads import IncompleteSearchError, UnlistedVideoFinder
+from app.services.search_cache import MISS, SearchResultCache
+from app.services.quota import quota_ledger
+from app.services.result_sets import CursorExpiredError, ResultSetStore
+from app.services.result_filter import filter_and_sort, prepare_columns
+from app.services.video_index import VideoIndexError, video_index
+from app.services.prefetch import PrefetchScheduler, QueryPopularity
 from app.models.video import Video
 from app.models.ad import Ad
-from app.models.unlisted_ad import UnlistedVideo, VideoCategory
-from fastapi.responses import JSONResponse
+from app.models.unlisted_ad import SearchSource, SortField, SortOrder, StreamFormat, UnlistedVideo, UnlistedVideoList, UnlistedVideoPage, VideoCategory
+from app.api.serialization import VIDEOS, json_response, unlisted_list_response, unlisted_page_response
+from app.config.settings import settings
+from app.utils.metrics import register_cache
+from app.utils.profiling import ProfiledRoute, profiling_enabled
+from app.utils.shared_state import shared_state
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
+import asyncio
+import json
+import logging
 import os
 from dotenv import load_dotenv
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=ProfiledRoute if profiling_enabled() else APIRoute)
 load_dotenv()
 
-unlisted_finder = UnlistedVideoFinder()
+unlisted_finder = UnlistedVideoFinder(index=video_index)
+# Shared with the other workers on the host unless the backend is per process
+_shared = shared_state if shared_state.cross_process else None
+search_cache = SearchResultCache(shared=_shared, namespace="unlisted")
+result_sets = ResultSetStore(shared=_shared)
+register_cache("unlisted_search", search_cache)
+query_popularity = QueryPopularity(shared_state)
+prefetch_scheduler = PrefetchScheduler(unlisted_finder, search_cache, shared_state, query_popularity)
 
 @router.get("/")
 async def root():
@@ -27,7 +53,8 @@ async def search_videos(
     category: Optional[str] = Query(None),
     channel_name: Optional[str] = Query(None)
 ):
-    return await youtube_service.search_videos(keyword, category, channel_name)
+    videos = await youtube_service.search_videos(keyword, category, channel_name)
+    return json_response(VIDEOS, videos)
 
 @router.get("/search-video-ads", response_model=List[Ad])
 async def search_video_ads(
@@ -38,6 +65,11 @@ async def search_video_ads(
 ):
     return await ads_service.search_video_ads(keyword, category, channel_name)
 
+@router.get("/quota")
+async def get_quota_usage():
+    """Today's YouTube Data API quota spend, remaining budget and rejections."""
+    return await quota_ledger.state.run(quota_ledger.snapshot)
+
 @router.get("/categories")
 async def get_available_categories():
     """Get list of available video categories."""
@@ -46,29 +78,113 @@ async def get_available_categories():
         "total": len(VideoCategory)
     }
 
-@router.get("/search-unlisted", response_model=Dict[str, Union[int, List[UnlistedVideo]]])
+@router.get("/search-unlisted", response_model=Union[UnlistedVideoList, UnlistedVideoPage])
 async def search_unlisted_videos(
     keyword: Optional[str] = Query(None, description="Search term"),
     category: Optional[VideoCategory] = Query(None, description="Video category"),
     channel_id: Optional[str] = Query(None, description="Channel ID"),
-    ads_only: bool = Query(True, description="Only return short videos suitable for ads")
+    ads_only: bool = Query(True, description="Only return short videos suitable for ads"),
+    stream: Optional[StreamFormat] = Query(None, description="Stream videos as they are parsed: ndjson or sse"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; enables cursor pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous paginated response"),
+    offset: Optional[int] = Query(None, ge=0, description="Position in the result set, overriding the cursor's"),
+    max_results: Optional[int] = Query(None, ge=1, le=500, description="Keep fetching pages until this many videos match"),
+    min_views: Optional[int] = Query(None, ge=0, description="Only videos with at least this many views"),
+    max_duration: Optional[int] = Query(None, ge=0, description="Only videos at most this many seconds long"),
+    min_subscribers: Optional[int] = Query(None, ge=0, description="Only channels with at least this many subscribers"),
+    uploaded_after: Optional[date] = Query(None, description="Only videos uploaded after this date (YYYY-MM-DD)"),
+    subtitle_language: Optional[List[str]] = Query(None, description="Only videos with subtitles in any of these languages; repeatable"),
+    sort_by: Optional[SortField] = Query(None, description="Sort by views, likes, subscribers, duration or uploaded"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction for sort_by"),
+    source: SearchSource = Query(SearchSource.REMOTE, description="remote (filmot), local (the local index) or hybrid")
 ):
     """
     Search for unlisted videos with various filters.
-    Returns videos sorted by view count.
+    Returns videos sorted by view count unless ``sort_by`` is given.
+
+    The ``min_*``, ``max_duration``, ``uploaded_after`` and
+    ``subtitle_language`` filters run server-side over the cached result
+    set; videos with an unknown value for a filtered field are left out.
+
+    With ``limit`` or ``cursor`` the full result set is kept server-side
+    and only one page is returned, along with cursors for later pages.
+    A cursor's result set is already filtered and sorted.
+
+    ``source=local`` answers from the local index of scraped videos only;
+    ``source=hybrid`` does so when the same search was fetched from filmot
+    within ``VIDEO_INDEX_MAX_AGE_SECONDS`` and goes to filmot otherwise.
     """
     try:
-        videos = await unlisted_finder.search_unlisted_videos(
-            keyword=keyword,
-            category=category.value if category else None,
-            channel_id=channel_id,
-            ads_only=ads_only
-        )
-        
-        # Convert dictionary results to UnlistedVideo models
-        video_models = [UnlistedVideo(**video) for video in videos]
-        return {"count": len(video_models), "videos": video_models}
+        if stream:
+            # A stream is always the whole, unsorted result
+            unsupported = [
+                name for name, value in
+                (("sort_by", sort_by), ("limit", limit), ("offset", offset), ("cursor", cursor))
+                if value is not None
+            ]
+            if unsupported:
+                raise ValueError(f"{', '.join(unsupported)} {'is' if len(unsupported) == 1 else 'are'} not supported with stream")
+        if cursor:
+            return await _paginate_unlisted(cursor=cursor, limit=limit, offset=offset)
+
+        filters = {
+            "min_views": min_views,
+            "max_duration": max_duration,
+            "min_subscribers": min_subscribers,
+            "uploaded_after": uploaded_after,
+            "subtitle_languages": subtitle_language
+        }
+        filtering = any(value is not None for value in filters.values())
+
+        search_params = {
+            "keyword": keyword,
+            "category": category.value if category else None,
+            "channel_id": channel_id,
+            "ads_only": ads_only,
+            "limit": max_results
+        }
+        local_videos = await _search_local(search_params, source)
+        if local_videos is None and settings.prefetch_enabled:
+            # Buffered in memory; the prefetch task writes it to the shared state
+            query_popularity.record(search_params)
+        if stream:
+            return await _stream_unlisted_videos(search_params, stream, filters if filtering else None, local_videos)
+
+        if local_videos is not None:
+            videos = local_videos
+        else:
+            videos = await search_cache.get_or_fetch(
+                unlisted_finder.query_key(**search_params),
+                lambda: unlisted_finder.search_unlisted_videos(**search_params)
+            )
+        if filtering or sort_by:
+            if local_videos is None:
+                await prepare_columns(videos)
+            videos = filter_and_sort(
+                videos,
+                sort_by=sort_by.value if sort_by else None,
+                descending=sort_order == SortOrder.DESC,
+                # Index results are a new list per request, not worth caching columns for
+                cached=local_videos is None,
+                **filters
+            )
+
+        if limit or offset is not None:
+            return await _paginate_unlisted(videos=videos, limit=limit or settings.result_set_page_size, offset=offset)
+
+        # Validated once and written straight to JSON bytes
+        return unlisted_list_response(videos)
         
+    except CursorExpiredError as e:
+        return JSONResponse(
+            status_code=410,
+            content={"detail": str(e)}
+        )
+    except VideoIndexError as e:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": f"Local video index unavailable: {str(e)}"}
+        )
     except ValueError as e:
         return JSONResponse(
             status_code=400,
@@ -76,3 +192,144 @@ async def search_unlisted_videos(
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+async def _search_local(search_params: Dict, source: SearchSource) -> Optional[List[Dict]]:
+    """Results from the local index, or None when the search should go to filmot."""
+    if source == SearchSource.REMOTE:
+        return None
+    if video_index is None:
+        raise ValueError("The local video index is disabled (VIDEO_INDEX_ENABLED=false)")
+    if source == SearchSource.HYBRID:
+        try:
+            age = await asyncio.to_thread(video_index.fetched_age, unlisted_finder.query_key(**search_params))
+        except VideoIndexError as e:
+            logger.warning(f"Local video index unavailable, searching filmot: {str(e)}")
+            return None
+        if age is None or age > settings.video_index_max_age_seconds:
+            return None
+    return await asyncio.to_thread(video_index.search, **search_params)
+
+async def _paginate_unlisted(
+    cursor: Optional[str] = None,
+    videos: Optional[List[Dict]] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None
+) -> Response:
+    page_videos, total, page_cursor, next_cursor = await result_sets.page(
+        cursor=cursor, items=videos, limit=limit, offset=offset
+    )
+    return unlisted_page_response(page_videos, total, page_cursor, next_cursor)
+
+async def _stream_unlisted_videos(
+    search_params: Dict,
+    stream_format: StreamFormat,
+    filters: Optional[Dict] = None,
+    local_videos: Optional[List[Dict]] = None
+) -> StreamingResponse:
+    """Stream search results page by page, ending with a summary record.
+
+    Cached results, fresh or stale, are served like the non-streaming
+    path. On a miss the stream follows the shared upstream search, which
+    also fills the cache, so identical concurrent streams fetch once.
+
+    The first page is fetched before responding so that upstream failures
+    still produce a proper error status; pages that fail later end the
+    stream with an error record. Rows that fail validation are skipped.
+    """
+    # Only a cached search result is the same list on later requests
+    cached = False
+    if local_videos is not None:
+        pages = _iter_cached(local_videos)
+    else:
+        key = unlisted_finder.query_key(**search_params)
+        fetch = lambda: unlisted_finder.search_unlisted_videos(**search_params)
+        _, state = await search_cache.get(key)
+        if state != MISS:
+            # A stale entry is served and refreshed in the background
+            pages = _iter_cached(await search_cache.get_or_fetch(key, fetch))
+            cached = True
+        else:
+            pages = unlisted_finder.follow_unlisted_videos(**search_params)
+            search_cache.fill(key, fetch)
+    if filters:
+        pages = _iter_filtered(pages, filters, cached)
+
+    try:
+        first_page = await pages.__anext__()
+    except StopAsyncIteration:
+        first_page = []
+    except IncompleteSearchError as e:
+        # Nothing usable came back; report it in the stream like a later failure
+        first_page, pages = [], _iter_error(e)
+
+    media_type = "text/event-stream" if stream_format == StreamFormat.SSE else "application/x-ndjson"
+    return StreamingResponse(
+        _encode_stream(first_page, pages, stream_format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _iter_cached(videos: List[Dict]) -> AsyncIterator[List[Dict]]:
+    yield videos
+    if getattr(videos, "complete", True) is False:
+        raise IncompleteSearchError(videos.failures)
+
+async def _iter_error(error: Exception) -> AsyncIterator[List[Dict]]:
+    raise error
+    yield
+
+async def _iter_filtered(pages: AsyncIterator[List[Dict]], filters: Dict, cached: bool) -> AsyncIterator[List[Dict]]:
+    async for page_videos in pages:
+        if cached:
+            await prepare_columns(page_videos)
+        yield filter_and_sort(page_videos, cached=cached, **filters)
+
+def _stream_record(event: str, payload: str, stream_format: StreamFormat) -> str:
+    if stream_format == StreamFormat.SSE:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+async def _encode_stream(
+    first_page: List[Dict],
+    pages: AsyncIterator[List[Dict]],
+    stream_format: StreamFormat
+) -> AsyncIterator[str]:
+    count = 0
+
+    def encode(page_videos: List[Dict]):
+        nonlocal count
+        for video in page_videos:
+            try:
+                payload = UnlistedVideo(**video).model_dump_json()
+            except ValidationError as e:
+                logger.warning(f"Skipping invalid video {video.get('video_id', 'unknown')}: {str(e)}")
+                continue
+            count += 1
+            yield _stream_record("video", payload, stream_format)
+
+    try:
+        for record in encode(first_page):
+            yield record
+        async for page_videos in pages:
+            for record in encode(page_videos):
+                yield record
+        yield _stream_record("summary", json.dumps({"count": count}), stream_format)
+    except Exception as e:
+        detail = getattr(e, "detail", str(e))
+        logger.error(f"Streaming search failed: {detail}")
+        yield _stream_record("error", json.dumps({"detail": detail, "count": count}), stream_format)
+
+@router.get("/search-unlisted/cache-stats")
+async def get_search_cache_stats():
+    """Hit/miss counters for the unlisted search result cache."""
+    return search_cache.stats()
+
+@router.get("/search-unlisted/index-stats")
+async def get_video_index_stats():
+    """Size of the local index of scraped unlisted videos."""
+    if video_index is None:
+        return {"enabled": False}
+    try:
+        return {"enabled": True, **await asyncio.to_thread(video_index.stats)}
+    except VideoIndexError as e:
+        raise HTTPException(status_code=503, detail=str(e))
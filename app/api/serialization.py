@@ -0,0 +1,47 @@
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from typing import Any, Dict, List
+from app.models.unlisted_ad import UnlistedVideo, UnlistedVideoList, UnlistedVideoPage
+from app.models.video import Video
+from app.utils.profiling import stage
+
+# Built once: a TypeAdapter compiles its validator and serializer up front
+UNLISTED_VIDEOS = TypeAdapter(List[UnlistedVideo])
+UNLISTED_VIDEO_LIST = TypeAdapter(UnlistedVideoList)
+UNLISTED_VIDEO_PAGE = TypeAdapter(UnlistedVideoPage)
+VIDEOS = TypeAdapter(List[Video])
+
+
+def validate_unlisted_videos(videos: List[Dict]) -> List[UnlistedVideo]:
+    """Validate scraped video dicts in one call into pydantic-core."""
+    with stage("validate"):
+        return UNLISTED_VIDEOS.validate_python(videos)
+
+
+def json_response(adapter: TypeAdapter, value: Any) -> Response:
+    """Serialize already-validated ``value`` straight to JSON bytes.
+
+    Endpoints return this instead of a plain object so FastAPI skips its
+    response_model validation and jsonable_encoder pass; the declared
+    response_model then only documents the schema.
+    """
+    with stage("serialize"):
+        return Response(content=adapter.dump_json(value), media_type="application/json")
+
+
+def unlisted_list_response(videos: List[Dict]) -> Response:
+    video_models = validate_unlisted_videos(videos)
+    return json_response(
+        UNLISTED_VIDEO_LIST,
+        UnlistedVideoList.model_construct(count=len(video_models), videos=video_models)
+    )
+
+
+def unlisted_page_response(videos: List[Dict], total: int, cursor: str, next_cursor) -> Response:
+    video_models = validate_unlisted_videos(videos)
+    return json_response(
+        UNLISTED_VIDEO_PAGE,
+        UnlistedVideoPage.model_construct(
+            count=len(video_models), total=total, videos=video_models, cursor=cursor, next_cursor=next_cursor
+        )
+    )
@@ -1,14 +1,95 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
     youtube_api_key: str 
     rate_limit_per_minute: int = 60
+    rate_limit_routes: Dict[str, int] = {}  # route path -> requests/minute per client
+    rate_limit_per_token: int = 0  # requests/minute per access token, 0 = off
+    rate_limit_max_clients: int = 200000
     environment: str = "development"
     JWT_SECRET_KEY: str 
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 120
+    jwt_cache_max_entries: int = 10000  # verified tokens kept until they expire
+
+    # filmot.com HTTP client
+    filmot_base_url: str = "https://filmot.com/unlistedSearch"  # point at a local stand-in for load tests
+    filmot_timeout_seconds: float = 15.0
+    filmot_connect_timeout_seconds: float = 5.0
+    filmot_max_connections: int = 20
+    filmot_max_keepalive_connections: int = 10
+    filmot_keepalive_expiry_seconds: float = 30.0
+    filmot_page_concurrency: int = 4
+    filmot_max_pages: int = 10  # page cap for limit-driven searches
+    filmot_rows_per_page: int = 50  # rows on a full result page, to size limit-driven waves
+    filmot_search_deadline_seconds: float = 20.0  # no new page wave after this
+    filmot_html_parser: str = "html.parser"  # or "lxml" when installed
+
+    # HTML parsing off the event loop: "process", "thread" or "inline"
+    parse_executor: str = "process"
+    parse_workers: int = 0  # 0 = CPU cores / web_concurrency
+    parse_start_method: str = "forkserver"  # or "spawn"; pool processes are never forked from a worker
+    web_concurrency: int = 1  # web workers on the host; gunicorn also reads WEB_CONCURRENCY as its -w default
+
+    # /api/search-unlisted result cache
+    search_cache_ttl_seconds: int = 300
+    search_cache_stale_seconds: int = 900  # served stale while refreshing
+    search_cache_max_entries: int = 1000
+    search_cache_max_bytes: int = 64 * 1024 * 1024
+    search_cache_partial_ttl_seconds: int = 30  # results with failed pages
+
+    # Background prefetch of popular searches and every category
+    prefetch_enabled: bool = True
+    prefetch_interval_seconds: int = 30
+    prefetch_refresh_ahead_seconds: int = 60  # refresh entries going stale within this
+    prefetch_top_queries: int = 30
+    prefetch_min_searches: int = 2  # popularity score needed to be prefetched
+    prefetch_popularity_window_seconds: int = 3600
+    prefetch_budget_pages_per_hour: int = 600  # filmot pages, shared by all workers
+    prefetch_min_backoff_seconds: int = 60  # pause after a filmot 403, doubling
+    prefetch_max_backoff_seconds: int = 3600
+
+    # Opt-in request profiling: send "X-Profile: <token>" or sample a share of requests
+    profiling_token: Optional[str] = None
+    profiling_sample_rate: float = 0.0
+    profiling_dir: str = "profiles"
+
+    # State shared by all workers on the host: rate-limit counters, search
+    # results, result sets, the quota ledger and metrics. "sqlite" or "memory" (per worker)
+    shared_state_backend: str = "sqlite"
+    shared_state_path: str = "shared_state.sqlite3"
+    shared_state_threads: int = 4  # threads for shared-state calls, apart from the default executor
+    metrics_publish_interval_seconds: int = 15  # workers' metrics snapshots for /metrics
+
+    # Cursor-paginated result sets
+    result_set_ttl_seconds: int = 1800
+    result_set_max_entries: int = 2000
+    result_set_page_size: int = 9
+    result_filter_cache_entries: int = 64  # column stores of filtered result lists
+    result_filter_min_rows: int = 1000  # smaller lists are filtered with a plain scan
+
+    # Local index of every scraped unlisted video (SQLite + FTS5)
+    video_index_enabled: bool = True
+    video_index_path: str = "video_index.sqlite3"
+    video_index_max_age_seconds: int = 86400  # source=hybrid goes to filmot after this
+    video_index_search_limit: int = 500
+    video_index_max_pending: int = 20000  # scraped videos waiting to be indexed before new ones are dropped
+
+    # YouTube Data API client
+    youtube_api_endpoint: Optional[str] = None  # e.g. http://127.0.0.1:9100/ for a local stand-in
+    youtube_timeout_seconds: float = 15.0  # socket timeout
+    youtube_call_timeout_seconds: float = 20.0  # per API call, including queueing
+    youtube_max_workers: int = 8
+    youtube_cache_ttl_seconds: int = 900
+    youtube_cache_stale_seconds: int = 3600
+
+    # YouTube Data API quota (units per Pacific day, shared by all workers)
+    youtube_daily_quota: int = 10000
+    youtube_quota_reserve: int = 1000  # degrade once remaining quota reaches this
+    youtube_degraded_max_results: int = 10
+    youtube_discovery_document: Optional[str] = None  # defaults to the bundled copy
 
     @property
     def is_production(self):
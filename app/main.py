@@ -1,9 +1,16 @@
 from fastapi import FastAPI, Depends
-from app.api.routes import router as api_router
+from fastapi.responses import PlainTextResponse
+from app.api.routes import router as api_router, prefetch_scheduler, unlisted_finder
 from app.api.auth import router as auth_router
 from fastapi.middleware.cors import CORSMiddleware
 from app.middleware.auth import verify_api_key
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 from app.config.settings import settings
+from app.services import youtube_client
+from app.utils.shared_state import shared_state
+from app.utils.worker_metrics import worker_metrics
+from app.utils.profiling import profiling_enabled
 import logging
 
 # Configure logging
@@ -25,6 +32,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
 
 # Auth routes without token verification
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
@@ -37,6 +47,26 @@ app.include_router(
     tags=["api"]
 )
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint (totals across the workers on the host)."""
+    return PlainTextResponse(await worker_metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    unlisted_finder.parse_executor.start()
+    worker_metrics.start()
+    if settings.prefetch_enabled:
+        prefetch_scheduler.start()
+
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    await prefetch_scheduler.stop()
+    await worker_metrics.stop()
+    await unlisted_finder.aclose()
+    youtube_client.shutdown()
+    shared_state.shutdown()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,51 +1,174 @@
 from fastapi import HTTPException, Security, Request
 from fastapi.security.api_key import APIKeyHeader
 from app.config.settings import settings
+from app.utils.metrics import RATE_LIMIT_REJECTIONS
+from app.utils.shared_state import SharedStateError, shared_state
+from cachetools import TLRUCache
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+import hashlib
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
 class RateLimiter:
-    def __init__(self):
-        self.requests = {}  # {client_id: [timestamps]}
-        self.limit = settings.rate_limit_per_minute
-        
-    def is_rate_limited(self, client_id: str) -> bool:
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        if client_id not in self.requests:
+    """Token-bucket rate limiter with constant cost per check.
+
+    Each key holds one compact bucket refilled at ``limit`` tokens per
+    ``period`` seconds. Buckets idle for a full period are back to full
+    capacity, so they are evicted (oldest first) instead of kept forever;
+    ``max_keys`` caps memory even under a flood of distinct clients.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        period: float = 60.0,
+        max_keys: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        self.limit = limit or settings.rate_limit_per_minute
+        self.period = period
+        self.max_keys = max_keys or settings.rate_limit_max_clients
+        self._timer = timer
+        self._buckets: "OrderedDict[Hashable, _Bucket]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict(self, now: float):
+        buckets = self._buckets
+        idle_before = now - self.period
+        while buckets:
+            key, bucket = next(iter(buckets.items()))
+            if bucket.updated > idle_before and len(buckets) < self.max_keys:
+                break
+            del buckets[key]
+
+    def _bucket(self, key: Hashable, limit: int, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._evict(now)
+            bucket = self._buckets[key] = _Bucket(limit, now)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(limit, bucket.tokens + (now - bucket.updated) * limit / self.period)
+            bucket.updated = now
+        return bucket
+
+    def hit(self, checks: Iterable[Tuple[Hashable, int]]) -> bool:
+        """Take one request from every ``(key, limit)`` bucket.
+
+        Returns False, consuming nothing, if any of them is exhausted.
+        """
+        now = self._timer()
+        buckets = [self._bucket(key, limit, now) for key, limit in checks]
+        if any(bucket.tokens < 1 for bucket in buckets):
             return False
-            
-        # Filter requests within the last minute
-        recent_requests = [
-            timestamp for timestamp in self.requests[client_id] 
-            if timestamp > minute_ago
-        ]
-        
-        # Update requests with only recent ones
-        self.requests[client_id] = recent_requests
-        
-        # Check if number of recent requests exceeds limit
-        return len(recent_requests) >= self.limit
+        for bucket in buckets:
+            bucket.tokens -= 1
+        return True
 
-    def add_request(self, client_id: str):
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        self.requests[client_id].append(datetime.now())
+    def is_rate_limited(self, client_id: str) -> bool:
+        """Check and count one request for ``client_id`` at the default limit."""
+        return not self.hit([(client_id, self.limit)])
 
-rate_limiter = RateLimiter()
+class SharedRateLimiter:
+    """Sliding-window rate limiter whose counters live in the shared state.
 
-async def verify_api_key(request: Request, api_key: str = Security(api_key_header)):
-    if not api_key:
-        raise HTTPException(
-            status_code=401,
-            detail="No API key provided. Please include X-API-Key header"
+    Every worker on the host counts into the same per-window counters, so a
+    limit holds for the whole deployment rather than per worker. The count
+    for the trailing ``period`` is estimated from the current fixed window
+    plus the previous one, weighted by how much of it still overlaps.
+    """
+
+    def __init__(self, state, limit: Optional[int] = None, period: float = 60.0, timer: Callable[[], float] = time.time):
+        self.state = state
+        self.limit = limit or settings.rate_limit_per_minute
+        self.period = period
+        self._timer = timer
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        parts = key if isinstance(key, tuple) else (key,)
+        return "rl:" + ":".join(str(part) for part in parts)
+
+    def hit(self, checks: Iterable[Tuple[Hashable, int]]) -> bool:
+        """Count one request against every ``(key, limit)`` window.
+
+        Returns False, and takes the request back out of every window, if
+        any of them is over its limit. Fails open if the state is unavailable.
+        """
+        now = self._timer()
+        window, elapsed = divmod(now, self.period)
+        overlap = 1 - elapsed / self.period
+        counted = []
+        try:
+            allowed = True
+            for key, limit in checks:
+                key = self._key(key)
+                current_key = f"{key}:{int(window)}"
+                current = self.state.incr(current_key, 1, ttl=2 * self.period)
+                counted.append(current_key)
+                previous = self.state.counter(f"{key}:{int(window) - 1}")
+                if previous * overlap + current > limit:
+                    allowed = False
+                    break
+            if not allowed:
+                for current_key in counted:
+                    self.state.incr(current_key, -1, ttl=2 * self.period)
+            return allowed
+        except SharedStateError as e:
+            logger.error(f"Rate limit state unavailable: {str(e)}")
+            return True
+
+    def is_rate_limited(self, client_id: str) -> bool:
+        """Check and count one request for ``client_id`` at the default limit."""
+        return not self.hit([(client_id, self.limit)])
+
+
+rate_limiter = SharedRateLimiter(shared_state) if shared_state.cross_process else RateLimiter()
+
+class VerifiedTokenCache(TLRUCache):
+    """Decoded payloads of already-verified tokens, keyed by token digest.
+
+    Each entry expires at its token's ``exp``, so a hit is a token that was
+    valid when verified and has not expired since.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, timer: Callable[[], float] = time.time):
+        super().__init__(
+            maxsize=maxsize or settings.jwt_cache_max_entries,
+            ttu=lambda _digest, payload, _now: payload["exp"],
+            timer=timer
         )
-    
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+
+token_cache = VerifiedTokenCache()
+
+def _verified_payload(api_key: str) -> dict:
+    """Verify ``api_key`` and return its payload, from the cache when possible."""
+    digest = VerifiedTokenCache.digest(api_key)
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         # Verify token is valid
         payload = jwt.decode(
@@ -62,9 +185,9 @@ async def verify_api_key(request: Request, api_key: str = Security(api_key_heade
         if datetime.utcfromtimestamp(exp) < datetime.utcnow():
             raise HTTPException(status_code=401, detail="Token has expired")
             
-        # Store token info in request state for later use if needed
-        request.state.token_data = payload
-        
+        token_cache[digest] = payload
+        return payload
+
     except JWTError as e:
         logger.error(f"JWT verification failed: {str(e)}")
         raise HTTPException(
@@ -79,14 +202,36 @@ async def verify_api_key(request: Request, api_key: str = Security(api_key_heade
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"}
         )
+
+async def verify_api_key(request: Request, api_key: str = Security(api_key_header)):
+    if not api_key:
+        raise HTTPException(
+            status_code=401,
+            detail="No API key provided. Please include X-API-Key header"
+        )
     
-    # Rate limiting check
+    payload = _verified_payload(api_key)
+    # Store token info in request state for later use if needed
+    request.state.token_data = payload
+
+    # Rate limiting check: per client, plus per route and per token when configured
     client_id = request.client.host
-    if rate_limiter.is_rate_limited(client_id):
+    checks = [(("client", client_id), settings.rate_limit_per_minute)]
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    route_limit = settings.rate_limit_routes.get(route_path)
+    if route_limit:
+        checks.append((("route", route_path, client_id), route_limit))
+    token_id = payload.get("jti")
+    if settings.rate_limit_per_token and token_id:
+        checks.append((("token", token_id), settings.rate_limit_per_token))
+
+    # SharedRateLimiter counts in SQLite, so it runs off the event loop
+    if not await shared_state.run(rate_limiter.hit, checks):
+        RATE_LIMIT_REJECTIONS.inc(route_path)
         raise HTTPException(
             status_code=429,
             detail="Rate limit exceeded. Please try again later."
         )
     
-    rate_limiter.add_request(client_id)
     return api_key
@@ -0,0 +1,35 @@
+from app.utils.metrics import HTTP_REQUEST_DURATION
+import time
+
+
+class MetricsMiddleware:
+    """Record request latency per route template, through the last body chunk.
+
+    Written as plain ASGI middleware so streamed responses are timed until
+    they finish rather than until their headers are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; unmatched paths
+            # share one label so random URLs cannot blow up the series count
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"], route, str(status))
@@ -0,0 +1,93 @@
+from starlette.datastructures import Headers, MutableHeaders
+from app.config.settings import settings
+from app.utils.profiling import ENDPOINT_END, server_timing, start_timings, stop_timings
+from pathlib import Path
+from typing import Optional
+import asyncio
+import cProfile
+import hmac
+import logging
+import random
+import secrets
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """Profile selected requests and report their stages in Server-Timing.
+
+    A request is profiled when it carries ``X-Profile: <profiling_token>`` or
+    is picked by ``profiling_sample_rate``. Its handler runs under cProfile
+    and the stats are written to ``profiling_dir`` as a ``.prof`` file
+    (open with ``python -m pstats`` or snakeviz). cProfile sees the whole
+    event loop thread, so requests served concurrently show up in the same
+    profile; only one profiler runs at a time and requests that overlap it
+    get Server-Timing only.
+
+    Only installed when profiling is configured, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app, token: Optional[str] = None, sample_rate: Optional[float] = None, directory: Optional[str] = None):
+        self.app = app
+        self.token = settings.profiling_token if token is None else token
+        self.sample_rate = settings.profiling_sample_rate if sample_rate is None else sample_rate
+        self.directory = Path(directory or settings.profiling_dir)
+        self._busy = False
+
+    def _selected(self, scope) -> bool:
+        if self.token:
+            value = Headers(scope=scope).get(PROFILE_HEADER)
+            if value and hmac.compare_digest(value.encode(), self.token.encode()):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_timings()
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}"
+        profiler = None
+        if not self._busy:
+            self._busy = True
+            profiler = cProfile.Profile()
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                endpoint_end = timings.pop(ENDPOINT_END, None)
+                if endpoint_end is not None:
+                    timings["serialize"] = timings.get("serialize", 0.0) + now - endpoint_end
+                timings["total"] = now - start
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(timings))
+                if profiler is not None:
+                    headers.append("X-Profile-Id", profile_id)
+            await send(message)
+
+        try:
+            if profiler is not None:
+                profiler.enable()
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._busy = False
+                await asyncio.to_thread(self._dump, profiler, scope, profile_id)
+            stop_timings()
+
+    def _dump(self, profiler: cProfile.Profile, scope, profile_id: str):
+        route = getattr(scope.get("route"), "path", scope["path"])
+        slug = route.strip("/").replace("/", "_") or "root"
+        path = self.directory / f"{profile_id}-{slug}.prof"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(path))
+            logger.info(f"Wrote request profile {path}")
+        except OSError as e:
+            logger.error(f"Failed to write request profile: {str(e)}")
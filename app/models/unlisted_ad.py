@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
 from enum import Enum
-from datetime import datetime
+from datetime import date, datetime
 
 class VideoCategory(str, Enum):
     AUTOS_VEHICLES = "Autos & Vehicles"       # 12
@@ -25,6 +25,26 @@ class VideoCategory(str, Enum):
     TRAILERS = "Trailers"                    # 26
     TRAVEL_EVENTS = "Travel & Events"        # 19
 
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    SSE = "sse"
+
+class SearchSource(str, Enum):
+    LOCAL = "local"
+    REMOTE = "remote"
+    HYBRID = "hybrid"
+
+class SortField(str, Enum):
+    VIEWS = "views"
+    LIKES = "likes"
+    SUBSCRIBERS = "subscribers"
+    DURATION = "duration"
+    UPLOADED = "uploaded"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
 class LanguageInfo(BaseModel):
     auto_generated: List[str] = Field(default_factory=list)
     subtitles: List[str] = Field(default_factory=list)
@@ -49,8 +69,24 @@ class UnlistedVideo(BaseModel):
     likes: str
     dislikes: str
     upload_date: str
+    views_count: Optional[int] = None
+    likes_count: Optional[int] = None
+    dislikes_count: Optional[int] = None
+    subscribers_count: Optional[int] = None
+    uploaded_on: Optional[date] = None
     languages: LanguageInfo
     channel_info: Optional[ChannelInfo] = None
 
     class Config:
         use_enum_values = True
+
+class UnlistedVideoList(BaseModel):
+    count: int
+    videos: List[UnlistedVideo]
+
+class UnlistedVideoPage(BaseModel):
+    count: int
+    total: int
+    videos: List[UnlistedVideo]
+    cursor: str
+    next_cursor: Optional[str] = None
@@ -2,8 +2,10 @@ from app.config.settings import settings
 from app.models.ad import Ad
 from typing import List
 from fastapi import HTTPException
+import asyncio
 import logging
-from googleapiclient.discovery import build
+from app.services.youtube_client import get_youtube_client, execute_async
+from app.services.quota import quota_ledger
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -14,7 +16,7 @@ class GoogleAdsService:
         try:
             if not settings.youtube_api_key:
                 raise ValueError("YouTube API key is not configured")
-            self.youtube = build('youtube', 'v3', developerKey=settings.youtube_api_key)
+            self.youtube = get_youtube_client()
             logger.info("YouTube service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize YouTube service: {str(e)}")
@@ -44,7 +46,11 @@ class GoogleAdsService:
                 search_params['q'] = channel_name
                     
             logger.debug(f"Searching YouTube ads with params: {search_params}")
-            response = self.youtube.search().list(**search_params).execute()
+            request = self.youtube.search().list(**search_params)
+            if not await quota_ledger.try_spend({"search.list": 1}):
+                await quota_ledger.record_rejection("search.list")
+                raise HTTPException(status_code=429, detail="YouTube API quota exceeded")
+            response = await execute_async(request)
 
             ads = []
             for item in response.get("items", []):
@@ -70,6 +76,11 @@ class GoogleAdsService:
             logger.info(f"Found {len(ads)} video ads")
             return ads
 
+        except HTTPException:
+            raise
+        except asyncio.TimeoutError:
+            logger.error("YouTube API request timed out")
+            raise HTTPException(status_code=504, detail="YouTube API request timed out")
         except Exception as e:
             logger.error(f"Error searching video ads: {str(e)}")
             raise HTTPException(status_code=500, detail={str(e)})
\ No newline at end of file
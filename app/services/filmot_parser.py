@@ -0,0 +1,209 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from functools import lru_cache
+from typing import List, Dict, Optional
+import logging
+from app.config.settings import settings
+from app.utils.normalize import parse_count, parse_date
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+RESULTS_TABLE_CLASS = "table border border-primary table-striped resp-tbl"
+
+# Only the results table is built into a tree; the rest of the page is skipped
+RESULTS_TABLE_STRAINER = SoupStrainer('table', class_=RESULTS_TABLE_CLASS)
+# Channel pages read every row on the page, so keep all <tr> elements
+ROWS_STRAINER = SoupStrainer('tr')
+
+
+def get_parser_backend() -> str:
+    """Return the BeautifulSoup backend to use, falling back to html.parser."""
+    backend = settings.filmot_html_parser
+    if backend == "lxml" and not LXML_AVAILABLE:
+        logger.warning("lxml is not installed, falling back to html.parser")
+        return "html.parser"
+    return backend
+
+
+def parse_result_rows(html: str) -> Optional[List[Tag]]:
+    """Parse the results table of an unlistedSearch page.
+
+    Returns the body rows, or None when the page has no results table.
+    """
+    soup = BeautifulSoup(html, get_parser_backend(), parse_only=RESULTS_TABLE_STRAINER)
+    table = soup.find('table', class_=RESULTS_TABLE_CLASS)
+    if not table or not table.find('tbody'):
+        return None
+    return table.find('tbody').find_all('tr')
+
+
+def parse_all_rows(html: str) -> List[Tag]:
+    """Parse every table row on the page."""
+    soup = BeautifulSoup(html, get_parser_backend(), parse_only=ROWS_STRAINER)
+    return soup.find_all('tr')
+
+
+def index_cells(row: Tag) -> Dict[str, Tag]:
+    """Map each ``dth`` attribute to the first cell carrying it, in one pass."""
+    cells = {}
+    for td in row.find_all('td'):
+        dth = td.get('dth')
+        if dth is not None and dth not in cells:
+            cells[dth] = td
+    return cells
+
+
+@lru_cache(maxsize=4096)
+def parse_duration_to_seconds(duration: str) -> int:
+    """Convert duration string to seconds.
+    Handles formats:
+    - HHhMMmSSs
+    - MMmSSs
+    - SSs
+    """
+    try:
+        # Clean the duration string and remove special characters
+        duration = duration.replace('▼', '').replace('▲', '').strip()
+        if not duration:
+            return 0
+
+        hours = 0
+        minutes = 0
+        seconds = 0
+
+        for component in duration.lower().split():
+            if 'h' in component:
+                hours = int(''.join(filter(str.isdigit, component)))
+            elif 'm' in component:
+                minutes = int(''.join(filter(str.isdigit, component)))
+            elif 's' in component:
+                seconds = int(''.join(filter(str.isdigit, component)))
+
+        return (hours * 3600) + (minutes * 60) + seconds
+
+    except Exception:
+        return 0
+
+
+def _cell_text(cells: Dict[str, Tag], name: str, default: str) -> str:
+    cell = cells.get(name)
+    return cell.text.strip() if cell else default
+
+
+def _cell_image_titles(cells: Dict[str, Tag], name: str) -> List[str]:
+    cell = cells.get(name)
+    return [img['title'] for img in cell.find_all('img')] if cell else []
+
+
+def extract_video_data(row: Tag) -> Optional[Dict]:
+    """Extract video data from a table row."""
+    try:
+        cells = index_cells(row)
+        title_td = cells.get('Title')
+        channel_td = cells.get('Channel')
+
+        if not title_td or not channel_td:
+            logger.warning("Missing required TD elements")
+            return None
+
+        video_link = title_td.find('a')
+        if not video_link or 'href' not in video_link.attrs:
+            logger.warning("Missing video link")
+            return None
+
+        duration = _cell_text(cells, 'Duration', "0:00")
+        thumbnail = title_td.find('img', class_='lozad')
+        channel_link = channel_td.find('a')
+        subscribers = channel_td.find('small')
+        category_td = cells.get('Category')
+
+        subscribers_text = subscribers.text.strip() if subscribers else "Unknown"
+        views = _cell_text(cells, 'Views', "0")
+        likes = _cell_text(cells, 'Likes', "0")
+        dislikes = _cell_text(cells, 'Dislikes', "0")
+        upload_date = _cell_text(cells, 'Uploaded', "Unknown")
+
+        result = {
+            'title': video_link.text.strip(),
+            'video_id': video_link['href'].split('=')[-1],
+            'url': video_link['href'],
+            'thumbnail': thumbnail['data-src'] if thumbnail else "",
+            'channel_name': channel_link.text.strip(),
+            'channel_id': channel_link['href'].split('/')[-1],
+            'subscribers': subscribers_text,
+            'category': category_td.find('a').text.strip() if category_td else "Unknown",
+            'duration': duration,
+            'duration_seconds': parse_duration_to_seconds(duration),
+            'views': views,
+            'likes': likes,
+            'dislikes': dislikes,
+            'upload_date': upload_date,
+            # Parsed once here so filters and sorts never re-parse display text
+            'views_count': parse_count(views),
+            'likes_count': parse_count(likes),
+            'dislikes_count': parse_count(dislikes),
+            'subscribers_count': parse_count(subscribers_text),
+            'uploaded_on': parse_date(upload_date),
+            'languages': {
+                'auto_generated': _cell_image_titles(cells, 'Auto-Generated'),
+                'subtitles': _cell_image_titles(cells, 'Subtitles')
+            }
+        }
+
+        # Validate required fields
+        if not all(result.get(field) for field in ['title', 'video_id', 'channel_name']):
+            logger.warning("Missing required fields in extracted data")
+            return None
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Error extracting video data: {str(e)}")
+        return None
+
+
+def extract_page_videos(html: str) -> Optional[List[Dict]]:
+    """Extract every valid video on a search results page.
+
+    Returns None when the page has no results table. This is a plain
+    module-level function so it can be shipped to a process pool.
+    """
+    rows = parse_result_rows(html)
+    if rows is None:
+        return None
+    return [video for video in (extract_video_data(row) for row in rows) if video]
+
+
+def extract_channel_page_videos(html: str) -> List[Dict]:
+    """Extract every valid video on a channel page, tagged with channel info."""
+    results = []
+    channel_info = None
+    for row in parse_all_rows(html):
+        try:
+            # Get channel info from first valid row
+            if not channel_info:
+                channel_td = row.find('td', {'dth': 'Channel'})
+                if channel_td:
+                    channel_info = {
+                        'name': channel_td.find('a').text.strip(),
+                        'channel_id': channel_td.find('a')['href'].split('/')[-1],
+                        'subscribers': channel_td.find('small').text.strip() if channel_td.find('small') else "Unknown"
+                    }
+
+            video_data = extract_video_data(row)
+            if video_data:
+                if channel_info:
+                    video_data['channel_info'] = channel_info
+                results.append(video_data)
+
+        except Exception as e:
+            logger.error(f"Error processing row: {str(e)}")
+            continue
+
+    return results
@@ -0,0 +1,111 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PARSE_MODES = ("process", "thread", "inline")
+START_METHODS = ("forkserver", "spawn")
+
+
+def _default_workers() -> int:
+    """The host's CPU cores shared out between the web workers, at least one each."""
+    return max(1, (os.cpu_count() or 1) // max(1, settings.web_concurrency))
+
+
+def _process_context(start_method: str):
+    # Never fork: a web worker has an event loop and threads running, and a
+    # forked child inherits their locks in whatever state they were in
+    if start_method not in multiprocessing.get_all_start_methods():
+        start_method = "spawn"
+    return multiprocessing.get_context(start_method)
+
+
+class ParseExecutor:
+    """Runs CPU-bound page parsing off the event loop.
+
+    ``process`` uses a process pool so parsing does not hold the worker's
+    GIL, falling back to a thread pool when processes cannot be started.
+    Its processes come from a ``forkserver`` (or ``spawn``) context, and by
+    default the host's cores are shared out between the ``web_concurrency``
+    web workers. ``thread`` always uses threads and ``inline`` parses on the
+    calling coroutine.
+    """
+
+    def __init__(self, mode: Optional[str] = None, max_workers: Optional[int] = None):
+        self.mode = mode or settings.parse_executor
+        if self.mode not in PARSE_MODES:
+            raise ValueError(f"Invalid parse executor: {self.mode}. Please use one of: {list(PARSE_MODES)}")
+        if settings.parse_start_method not in START_METHODS:
+            raise ValueError(
+                f"Invalid parse start method: {settings.parse_start_method}. Please use one of: {list(START_METHODS)}"
+            )
+        self.max_workers = max_workers or settings.parse_workers or _default_workers()
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.mode == "inline":
+            return None
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    try:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=_process_context(settings.parse_start_method)
+                        )
+                    except (OSError, NotImplementedError, ImportError) as e:
+                        logger.warning(f"Process pool unavailable, parsing in threads: {str(e)}")
+                        self.mode = "thread"
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="parse"
+                    )
+            return self._executor
+
+    def start(self):
+        """Start the worker pool, and its processes, before the first parse.
+
+        Called from the app's startup hook, so the first searches do not pay
+        for starting the fork server and its processes.
+        """
+        executor = self._get_executor()
+        if self.mode == "process":
+            # A process pool only starts a process when a task finds none idle
+            for _ in range(self.max_workers):
+                executor.submit(os.getpid)
+
+    def _fall_back_to_threads(self, broken: Executor):
+        with self._lock:
+            if self._executor is broken:
+                self.mode = "thread"
+                self._executor = None
+        broken.shutdown(wait=False)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Run ``func(*args)`` in the executor and await its result."""
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool as e:
+            logger.error(f"Parse process pool broke, switching to threads: {str(e)}")
+            self._fall_back_to_threads(executor)
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def shutdown(self):
+        """Stop the worker pool; a new one is started on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from app.config.settings import settings
+from app.models.unlisted_ad import VideoCategory
+from app.utils.metrics import PREFETCH_SEARCHES, UPSTREAM_ERRORS
+from app.utils.shared_state import SharedStateError
+
+logger = logging.getLogger(__name__)
+
+# Pages a search without max_results fetches (UnlistedVideoFinder's default)
+DEFAULT_PAGES = 2
+
+
+def _params_key(search_params: Dict) -> str:
+    return json.dumps(search_params, sort_keys=True)
+
+
+class QueryPopularity:
+    """Search counts per query over a sliding window, shared by all workers.
+
+    Counts live in the shared state as one counter per query and window;
+    a query's score is its count in the current window plus the previous
+    window's count weighted by how much of it still overlaps. Searches are
+    counted in memory by ``record`` and written in one batch by ``flush``,
+    which the prefetch scheduler calls before each run, so the request path
+    never touches the shared state.
+    """
+
+    def __init__(self, state, window: Optional[float] = None, timer=time.time):
+        self.state = state
+        self.window = window or settings.prefetch_popularity_window_seconds
+        self._timer = timer
+        self._pending: Dict[Tuple[int, str], int] = {}
+
+    def _prefix(self, window: int) -> str:
+        return f"prefetch:hits:{window}:"
+
+    def record(self, search_params: Dict):
+        key = (int(self._timer() // self.window), _params_key(search_params))
+        self._pending[key] = self._pending.get(key, 0) + 1
+
+    async def flush(self):
+        """Add the searches recorded since the last flush to the shared counts."""
+        # Swapped on the event loop, where record runs, before handing it to state.run
+        pending, self._pending = self._pending, {}
+        if pending:
+            await self.state.run(self._write, pending)
+
+    def _write(self, pending: Dict[Tuple[int, str], int]):
+        try:
+            for (window, key), count in pending.items():
+                self.state.incr(self._prefix(window) + key, count, ttl=2 * self.window)
+        except SharedStateError as e:
+            logger.warning(f"Could not record search popularity: {str(e)}")
+
+    def top(self, count: int, min_score: float = 1) -> List[Dict]:
+        """Search params of the ``count`` most popular queries, most popular first."""
+        now = self._timer()
+        window = int(now // self.window)
+        weight = 1 - (now % self.window) / self.window
+        try:
+            current = self.state.counters(self._prefix(window))
+            previous = self.state.counters(self._prefix(window - 1))
+        except SharedStateError as e:
+            logger.warning(f"Could not read search popularity: {str(e)}")
+            return []
+        scores = {key: current.get(key, 0) + previous.get(key, 0) * weight for key in current.keys() | previous.keys()}
+        ranked = sorted((key for key, score in scores.items() if score >= min_score), key=scores.get, reverse=True)
+        return [json.loads(key) for key in ranked[:count]]
+
+
+class PrefetchScheduler:
+    """Background task that keeps popular unlisted searches warm in the cache.
+
+    Every ``interval`` seconds it re-runs the ``top_n`` most popular searches
+    and one search per VideoCategory whose cache entry is missing or due to
+    go stale within ``refresh_ahead`` seconds, one at a time. Upstream pages
+    are charged against an hourly budget shared by all workers, each search
+    is claimed so only one worker refreshes it, and a filmot 403 (from any
+    search in this worker) pauses prefetching with exponential backoff.
+    Shared-state calls go through ``state.run``, off the event loop.
+    """
+
+    def __init__(self, finder, cache, state, popularity: QueryPopularity, timer=time.time):
+        self.finder = finder
+        self.cache = cache
+        self.state = state
+        self.popularity = popularity
+        self.interval = settings.prefetch_interval_seconds
+        self.refresh_ahead = settings.prefetch_refresh_ahead_seconds
+        self.top_n = settings.prefetch_top_queries
+        self.budget = settings.prefetch_budget_pages_per_hour
+        self._timer = timer
+        self._task: Optional[asyncio.Task] = None
+        self._backoff = 0.0
+        self._forbidden_seen = UPSTREAM_ERRORS.value("filmot", "http_403")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.popularity.flush()
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Prefetch run failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def candidates(self) -> List[Dict]:
+        """Searches to keep warm: popular queries first, then every category."""
+        popular = await self.state.run(self.popularity.top, self.top_n, settings.prefetch_min_searches)
+        categories = [
+            {"keyword": None, "category": category.value, "channel_id": None, "ads_only": True, "limit": None}
+            for category in VideoCategory
+        ]
+        seen = set()
+        unique = []
+        for search_params in popular + categories:
+            key = _params_key(search_params)
+            if key not in seen:
+                seen.add(key)
+                unique.append(search_params)
+        return unique
+
+    async def run_once(self) -> int:
+        """Refresh every candidate that is due; returns the number refreshed."""
+        if await self._backing_off():
+            return 0
+        refreshed = 0
+        for search_params in await self.candidates():
+            key = self.finder.query_key(**search_params)
+            if await self.cache.fresh_for(key) > self.refresh_ahead:
+                continue
+            if not await self.state.run(self._claim, search_params):
+                continue
+            if not await self.state.run(self._charge, search_params):
+                PREFETCH_SEARCHES.inc("budget_exhausted")
+                logger.info("Prefetch budget for this hour is used up")
+                break
+            try:
+                videos = await self.finder.search_unlisted_videos(**search_params)
+            except Exception as e:
+                videos = None
+                PREFETCH_SEARCHES.inc("error")
+                logger.warning(f"Prefetch of {search_params} failed: {getattr(e, 'detail', str(e))}")
+            if self._forbidden():
+                # Refused pages make the results partial, so keep the cached ones
+                await self._start_backoff()
+                break
+            if videos is not None:
+                await self.cache.set(key, videos)
+                PREFETCH_SEARCHES.inc("refreshed")
+                refreshed += 1
+        else:
+            self._backoff = 0.0
+        return refreshed
+
+    def _claim(self, search_params: Dict) -> bool:
+        """True for the one worker that gets to refresh this search in this interval."""
+        try:
+            return self.state.incr(f"prefetch:claim:{_params_key(search_params)}", ttl=self.interval) == 1
+        except SharedStateError:
+            return True
+
+    def _charge(self, search_params: Dict) -> bool:
+        """Take the search's upstream pages from the hourly budget, if they fit."""
+        pages = settings.filmot_max_pages if search_params.get("limit") else DEFAULT_PAGES
+        hour = int(self._timer() // 3600)
+        try:
+            used = self.state.incr(f"prefetch:budget:{hour}", pages, ttl=7200)
+        except SharedStateError:
+            return False
+        if used > self.budget:
+            try:
+                self.state.incr(f"prefetch:budget:{hour}", -pages, ttl=7200)
+            except SharedStateError as e:
+                logger.warning(f"Could not return unused prefetch budget: {str(e)}")
+            return False
+        return True
+
+    def _forbidden(self) -> bool:
+        seen = UPSTREAM_ERRORS.value("filmot", "http_403")
+        forbidden, self._forbidden_seen = seen > self._forbidden_seen, seen
+        return forbidden
+
+    async def _start_backoff(self):
+        self._backoff = min(
+            settings.prefetch_max_backoff_seconds,
+            max(settings.prefetch_min_backoff_seconds, self._backoff * 2)
+        )
+        PREFETCH_SEARCHES.inc("backoff")
+        logger.warning(f"filmot returned 403, pausing prefetch for {self._backoff:.0f}s")
+        await self.state.run(self._share_backoff, self._backoff)
+
+    def _share_backoff(self, backoff: float):
+        try:
+            until = self._timer() + backoff
+            self.state.set("prefetch:backoff", str(until).encode(), ttl=backoff)
+        except SharedStateError as e:
+            logger.warning(f"Could not share prefetch backoff: {str(e)}")
+
+    async def _backing_off(self) -> bool:
+        """True while this or another worker's 403 backoff is in effect."""
+        if self._forbidden():
+            await self._start_backoff()
+            return True
+        return await self.state.run(self._shared_backoff)
+
+    def _shared_backoff(self) -> bool:
+        try:
+            return self.state.get("prefetch:backoff") is not None
+        except SharedStateError:
+            return False
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import logging
+from app.config.settings import settings
+from app.utils.metrics import register_quota
+from app.utils.shared_state import SharedStateError, shared_state
+
+logger = logging.getLogger(__name__)
+
+# Unit cost of each YouTube Data API operation we call
+QUOTA_COSTS = {
+    "search.list": 100,
+    "videos.list": 1
+}
+
+# Day counters outlive their day so the previous day stays readable for a while
+COUNTER_TTL_SECONDS = 2 * 24 * 3600
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+except Exception:  # no tz database available
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+
+def quota_day() -> str:
+    """YouTube quotas reset at midnight Pacific time."""
+    return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+
+
+def quota_units(calls: Dict[str, int]) -> int:
+    """Units for ``calls``, a count of calls per operation."""
+    return sum(QUOTA_COSTS[operation] * count for operation, count in calls.items())
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call's units do not fit in today's remaining budget."""
+
+
+class QuotaLedger:
+    """Daily YouTube Data API quota spend, shared by every worker on the host.
+
+    Spend, rejections and degraded responses are counted per Pacific day in
+    the shared-state backend, so all gunicorn workers see the same totals.
+    The day's total spend is one counter, which ``try_spend`` checks and
+    charges in a single shared-state operation. The request-path methods
+    are coroutines that reach the backend through ``state.run``, off the
+    event loop for SQLite.
+    """
+
+    def __init__(self, state=None, daily_quota: Optional[int] = None, reserve: Optional[int] = None):
+        self.state = state or shared_state
+        self.daily_quota = settings.youtube_daily_quota if daily_quota is None else daily_quota
+        self.reserve = settings.youtube_quota_reserve if reserve is None else reserve
+
+    def _add(self, kind: str, name: str, value: int):
+        try:
+            self.state.incr(f"quota:{quota_day()}:{kind}:{name}", value, ttl=COUNTER_TTL_SECONDS)
+        except SharedStateError as e:
+            logger.error(f"Failed to update quota ledger: {str(e)}")
+
+    def _counters(self, kind: str) -> Dict[str, int]:
+        try:
+            return self.state.counters(f"quota:{quota_day()}:{kind}:")
+        except SharedStateError as e:
+            logger.error(f"Failed to read quota ledger: {str(e)}")
+            return {}
+
+    def spent(self) -> int:
+        try:
+            return self.state.counter(f"quota:{quota_day()}:total")
+        except SharedStateError as e:
+            logger.error(f"Failed to read quota ledger: {str(e)}")
+            return 0
+
+    def remaining(self) -> int:
+        return max(0, self.daily_quota - self.spent())
+
+    async def can_spend(self, units: int, use_reserve: bool = False) -> bool:
+        """Whether ``units`` fit in today's budget, keeping the reserve unless ``use_reserve``.
+
+        Only a hint for choosing a path: another worker can spend the units
+        before they are charged, so calls are paid for with ``try_spend``.
+        """
+        floor = 0 if use_reserve else self.reserve
+        return await self.state.run(self.remaining) - units >= floor
+
+    async def try_spend(self, calls: Dict[str, int], use_reserve: bool = False) -> bool:
+        """Charge ``calls`` (calls per operation) if their units fit in today's budget.
+
+        The check and the charge of the day's total are one shared-state
+        operation, so workers racing for the last units cannot overspend.
+        Keeps the reserve unless ``use_reserve``.
+        """
+        floor = 0 if use_reserve else self.reserve
+        return await self.state.run(self._try_spend, calls, self.daily_quota - floor)
+
+    def _try_spend(self, calls: Dict[str, int], limit: int) -> bool:
+        try:
+            total = self.state.incr_within(
+                f"quota:{quota_day()}:total", quota_units(calls), limit, ttl=COUNTER_TTL_SECONDS
+            )
+        except SharedStateError as e:
+            # Like a failed read, an unavailable ledger does not stop searches
+            logger.error(f"Failed to update quota ledger: {str(e)}")
+            return True
+        if total is None:
+            return False
+        for operation, count in calls.items():
+            self._add("spend", operation, QUOTA_COSTS[operation] * count)
+        return True
+
+    def _record_spend(self, calls: Dict[str, int]):
+        try:
+            self.state.incr(f"quota:{quota_day()}:total", quota_units(calls), ttl=COUNTER_TTL_SECONDS)
+        except SharedStateError as e:
+            logger.error(f"Failed to update quota ledger: {str(e)}")
+        for operation, count in calls.items():
+            self._add("spend", operation, QUOTA_COSTS[operation] * count)
+
+    async def charge(self, operation: str, calls: int = 1):
+        """Record ``calls`` calls of ``operation`` at its unit cost, whatever the budget."""
+        await self.state.run(self._record_spend, {operation: calls})
+
+    async def refund(self, operation: str, calls: int = 1):
+        """Give back units paid for with ``try_spend`` for calls that were not made."""
+        await self.state.run(self._record_spend, {operation: -calls})
+
+    async def record_rejection(self, operation: str):
+        await self.state.run(self._add, "rejected", operation, 1)
+
+    async def record_degraded(self, mode: str):
+        await self.state.run(self._add, "degraded", mode, 1)
+
+    def spend_by_operation(self) -> Dict[str, int]:
+        return self._counters("spend")
+
+    def rejections(self) -> Dict[str, int]:
+        return self._counters("rejected")
+
+    def degraded(self) -> Dict[str, int]:
+        return self._counters("degraded")
+
+    def snapshot(self) -> Dict:
+        spend = self.spend_by_operation()
+        spent = self.spent()
+        return {
+            "day": quota_day(),
+            "daily_quota": self.daily_quota,
+            "reserve": self.reserve,
+            "spent": spent,
+            "remaining": max(0, self.daily_quota - spent),
+            "spent_by_operation": spend,
+            "rejected": self.rejections(),
+            "degraded": self.degraded()
+        }
+
+
+quota_ledger = QuotaLedger()
+register_quota(quota_ledger)
@@ -0,0 +1,267 @@
+from array import array
+from bisect import bisect_left
+from cachetools import LRUCache
+from datetime import date
+from itertools import compress
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import threading
+from app.config.settings import settings
+
+# Rows per block between precomputed suffix bitmaps; at most MAX_BLOCKS per column
+MIN_BLOCK = 64
+MAX_BLOCKS = 64
+MISSING = -1
+
+# Expands one byte of a bitmap into eight one-byte row flags
+_EXPAND = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+SORT_COLUMNS = {
+    "views": "views_count",
+    "likes": "likes_count",
+    "subscribers": "subscribers_count",
+    "duration": "duration_seconds",
+    "uploaded": "uploaded_on"
+}
+
+
+def _bits(indices: Iterable[int], size: int) -> int:
+    """Bitmap (as an int) with the bits of ``indices`` set."""
+    buf = bytearray((size + 7) // 8)
+    for i in indices:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def _flags(mask: int, size: int) -> bytes:
+    """One byte per row, non-zero where ``mask`` has the row's bit set."""
+    return b"".join(map(_EXPAND.__getitem__, mask.to_bytes((size + 7) // 8, "little")))[:size]
+
+
+def _as_int(value) -> int:
+    if value is None:
+        return MISSING
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value).toordinal()
+        except ValueError:
+            return MISSING
+    return int(value)
+
+
+class _Column:
+    """One numeric column: values, their sort order and suffix bitmaps.
+
+    ``at_least`` finds the cut with a bisect and combines the precomputed
+    bitmap of every whole block above it with the few rows of the partial
+    block, so a threshold filter never walks the whole column.
+    """
+
+    def __init__(self, values: array):
+        self.size = len(values)
+        self.values = values
+        self.order = array("l", sorted(range(self.size), key=values.__getitem__))
+        self.sorted_values = array("q", map(values.__getitem__, self.order))
+        self.block = max(MIN_BLOCK, -(-self.size // MAX_BLOCKS))
+        blocks = -(-self.size // self.block)
+        self.suffix = [0] * (blocks + 1)
+        acc = 0
+        for j in range(blocks - 1, -1, -1):
+            acc |= _bits(self.order[j * self.block:(j + 1) * self.block], self.size)
+            self.suffix[j] = acc
+        self._descending = None
+
+    def at_least(self, threshold: int) -> int:
+        pos = bisect_left(self.sorted_values, threshold)
+        boundary = -(-pos // self.block)
+        mask = self.suffix[boundary] if boundary < len(self.suffix) else 0
+        if pos < boundary * self.block:
+            mask |= _bits(self.order[pos:boundary * self.block], self.size)
+        return mask
+
+    def at_most(self, threshold: int) -> int:
+        """Rows with a known value <= ``threshold``."""
+        return self.at_least(0) & ~self.at_least(threshold + 1)
+
+    def descending(self) -> array:
+        if self._descending is None:
+            values = self.values
+            self._descending = array("l", sorted(range(self.size), key=lambda i: -values[i]))
+        return self._descending
+
+
+class ResultColumns:
+    """Column-oriented, array-backed copy of one result list.
+
+    Built once per result list (see ``ColumnCache``); filters are bitmaps
+    combined with integer AND, and each sort order is a precomputed index
+    array, so selecting rows is a C-level permute and compress instead of a
+    Python loop. Rows with an unknown value never match a filter on that column.
+    """
+
+    def __init__(self, videos: Sequence[Dict]):
+        self.videos = videos
+        self.size = len(videos)
+        self.all = (1 << self.size) - 1
+        self.columns = {
+            name: _Column(array("q", (_as_int(video.get(name)) for video in videos)))
+            for name in SORT_COLUMNS.values()
+        }
+        by_language: Dict[str, List[int]] = {}
+        for i, video in enumerate(videos):
+            for language in (video.get("languages") or {}).get("subtitles", []):
+                by_language.setdefault(language.lower(), []).append(i)
+        self.subtitles = {language: _bits(rows, self.size) for language, rows in by_language.items()}
+        self._sorted: Dict[Tuple[str, bool], Tuple[itemgetter, Tuple[Dict, ...]]] = {}
+
+    def select(
+        self,
+        min_views: Optional[int] = None,
+        max_duration: Optional[int] = None,
+        min_subscribers: Optional[int] = None,
+        uploaded_after: Optional[date] = None,
+        subtitle_languages: Optional[Sequence[str]] = None
+    ) -> int:
+        """Bitmap of the rows matching every given filter.
+
+        ``subtitle_languages`` matches rows with subtitles in any of them.
+        """
+        mask = self.all
+        if min_views is not None:
+            mask &= self.columns["views_count"].at_least(min_views)
+        if max_duration is not None:
+            mask &= self.columns["duration_seconds"].at_most(max_duration)
+        if min_subscribers is not None:
+            mask &= self.columns["subscribers_count"].at_least(min_subscribers)
+        if uploaded_after is not None:
+            mask &= self.columns["uploaded_on"].at_least(uploaded_after.toordinal() + 1)
+        if subtitle_languages:
+            languages = 0
+            for language in subtitle_languages:
+                languages |= self.subtitles.get(language.lower(), 0)
+            mask &= languages
+        return mask
+
+    def order(self, sort_by: str, descending: bool = True) -> Sequence[int]:
+        """Row indices in the requested order."""
+        column = self.columns[SORT_COLUMNS[sort_by]]
+        return column.descending() if descending else column.order
+
+    def rows(self, mask: int, sort_by: Optional[str] = None, descending: bool = True) -> List[Dict]:
+        """The rows in ``mask``, in the requested order or the original one."""
+        if not sort_by:
+            if mask == self.all:
+                return list(self.videos)
+            return list(compress(self.videos, _flags(mask, self.size)))
+        key = (sort_by, descending)
+        if key not in self._sorted:
+            order = self.order(sort_by, descending)
+            # itemgetter with a single index returns the item, not a 1-tuple
+            permute = itemgetter(*order) if self.size > 1 else lambda seq: (seq[0],)
+            self._sorted[key] = (permute, permute(self.videos))
+        permute, ordered = self._sorted[key]
+        if mask == self.all:
+            return list(ordered)
+        return list(compress(ordered, permute(_flags(mask, self.size))))
+
+
+class ColumnCache:
+    """Column stores of recently filtered result lists, keyed by list identity.
+
+    Cached search results are the same list object on every hit, so the
+    columns are built once per cached result. Each entry keeps its list
+    alive (``ResultColumns.videos``), so an id is never reused while its
+    entry exists.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._entries = LRUCache(maxsize=max_entries or settings.result_filter_cache_entries)
+        self._lock = threading.Lock()
+
+    def has(self, videos: List[Dict]) -> bool:
+        with self._lock:
+            columns = self._entries.get(id(videos))
+        return columns is not None and columns.videos is videos
+
+    def get(self, videos: List[Dict]) -> ResultColumns:
+        with self._lock:
+            columns = self._entries.get(id(videos))
+        if columns is not None and columns.videos is videos:
+            return columns
+        columns = ResultColumns(videos)
+        with self._lock:
+            self._entries[id(videos)] = columns
+        return columns
+
+
+column_cache = ColumnCache()
+
+
+def _scan(
+    videos: Sequence[Dict],
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    min_views: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    min_subscribers: Optional[int] = None,
+    uploaded_after: Optional[date] = None,
+    subtitle_languages: Optional[Sequence[str]] = None
+) -> List[Dict]:
+    """Same rows and order as ResultColumns, from one pass over the dicts."""
+    uploaded_after = uploaded_after.toordinal() + 1 if uploaded_after is not None else None
+    languages = {language.lower() for language in subtitle_languages or ()}
+    rows = [
+        video for video in videos
+        if (min_views is None or _as_int(video.get("views_count")) >= min_views)
+        and (max_duration is None or 0 <= _as_int(video.get("duration_seconds")) <= max_duration)
+        and (min_subscribers is None or _as_int(video.get("subscribers_count")) >= min_subscribers)
+        and (uploaded_after is None or _as_int(video.get("uploaded_on")) >= uploaded_after)
+        and (not languages or any(
+            language.lower() in languages for language in (video.get("languages") or {}).get("subtitles", [])))
+    ]
+    if sort_by:
+        field = SORT_COLUMNS[sort_by]
+        if descending:
+            rows.sort(key=lambda video: -_as_int(video.get(field)))
+        else:
+            rows.sort(key=lambda video: _as_int(video.get(field)))
+    return rows
+
+
+def uses_columns(videos: Sequence[Dict], cached: bool = True) -> bool:
+    """Whether filter_and_sort goes through the column store for ``videos``."""
+    return cached and len(videos) >= settings.result_filter_min_rows
+
+
+def filter_and_sort(
+    videos: List[Dict],
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    cached: bool = True,
+    **filters
+) -> List[Dict]:
+    """Return the videos matching ``filters`` (see ResultColumns.select), in order.
+
+    Columns only pay off when they are reused, so one-off lists
+    (``cached=False``, such as streamed pages and index results) and lists
+    below ``settings.result_filter_min_rows`` are filtered with a plain scan.
+    """
+    if not videos:
+        return videos
+    if not uses_columns(videos, cached):
+        return _scan(videos, sort_by, descending, **filters)
+    columns = column_cache.get(videos)
+    return columns.rows(columns.select(**filters), sort_by, descending)
+
+
+async def prepare_columns(videos: List[Dict]):
+    """Build ``videos``' columns in a worker thread if filter_and_sort will need them.
+
+    Building takes tens of milliseconds for 10k rows, too long to run on
+    the event loop on a cached result's first filtered request.
+    """
+    if uses_columns(videos) and not column_cache.has(videos):
+        await asyncio.to_thread(column_cache.get, videos)
@@ -0,0 +1,118 @@
+from cachetools import TTLCache
+from typing import Any, List, Optional, Tuple
+import base64
+import binascii
+import json
+import logging
+import secrets
+import threading
+from app.config.settings import settings
+from app.utils.shared_state import SharedStateError
+
+logger = logging.getLogger(__name__)
+
+# Largest page a cursor may ask for, same as the route's ``limit`` bound
+MAX_PAGE_SIZE = 100
+
+
+class CursorError(ValueError):
+    """Raised for malformed cursors."""
+
+
+class CursorExpiredError(CursorError):
+    """Raised when a cursor's result set is no longer stored."""
+
+
+class ResultSetStore:
+    """Server-side snapshots of search results, paged through opaque cursors.
+
+    A result set is stored once with a TTL; cursors only carry its id, an
+    offset and a page size, so later pages are plain slices of the snapshot.
+    With a ``shared`` state backend the snapshot is also stored there, so a
+    cursor can be resumed by any worker; those reads and writes go through
+    ``shared.run`` so they never block the event loop.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None, shared=None):
+        self.ttl = settings.result_set_ttl_seconds if ttl is None else ttl
+        self._sets = TTLCache(maxsize=max_entries or settings.result_set_max_entries, ttl=self.ttl)
+        self._lock = threading.Lock()
+        self.shared = shared
+
+    async def put(self, items: List[Any]) -> str:
+        result_set_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._sets[result_set_id] = items
+        if self.shared is not None:
+            await self.shared.run(self._save_shared, result_set_id, items)
+        return result_set_id
+
+    def _save_shared(self, result_set_id: str, items: List[Any]):
+        try:
+            self.shared.set(f"result-set:{result_set_id}", json.dumps(items).encode(), ttl=self.ttl)
+        except (SharedStateError, TypeError, ValueError) as e:
+            logger.error(f"Failed to share result set: {str(e)}")
+
+    async def get(self, result_set_id: str) -> Optional[List[Any]]:
+        with self._lock:
+            items = self._sets.get(result_set_id)
+        if items is not None or self.shared is None:
+            return items
+        items = await self.shared.run(self._load_shared, result_set_id)
+        if items is not None:
+            with self._lock:
+                self._sets[result_set_id] = items
+        return items
+
+    def _load_shared(self, result_set_id: str) -> Optional[List[Any]]:
+        try:
+            raw = self.shared.get(f"result-set:{result_set_id}")
+        except SharedStateError as e:
+            logger.error(f"Failed to read shared result set: {str(e)}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    @staticmethod
+    def encode_cursor(result_set_id: str, offset: int, limit: int) -> str:
+        raw = json.dumps({"r": result_set_id, "o": offset, "l": limit}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            data = json.loads(raw)
+            result_set_id, offset, limit = str(data["r"]), int(data["o"]), int(data["l"])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise CursorError("Invalid cursor")
+        if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise CursorError("Invalid cursor")
+        return result_set_id, offset, limit
+
+    async def page(
+        self,
+        cursor: Optional[str] = None,
+        items: Optional[List[Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Tuple[List[Any], int, str, Optional[str]]:
+        """Return ``(page_items, total, cursor, next_cursor)``.
+
+        Either resumes the result set behind ``cursor`` or stores ``items``
+        as a new one. ``limit`` and ``offset`` override the cursor's own.
+        """
+        if cursor:
+            result_set_id, cursor_offset, cursor_limit = self.decode_cursor(cursor)
+            items = await self.get(result_set_id)
+            if items is None:
+                raise CursorExpiredError("Cursor has expired, please repeat the search")
+            offset = cursor_offset if offset is None else offset
+            limit = limit or cursor_limit
+        else:
+            result_set_id = await self.put(items)
+            offset = offset or 0
+
+        page_items = items[offset:offset + limit]
+        next_offset = offset + limit
+        next_cursor = self.encode_cursor(result_set_id, next_offset, limit) if next_offset < len(items) else None
+        return page_items, len(items), self.encode_cursor(result_set_id, offset, limit), next_cursor
@@ -0,0 +1,254 @@
+from cachetools import LRUCache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import json
+import logging
+import sys
+import time
+from app.config.settings import settings
+from app.utils.shared_state import SharedStateError
+
+logger = logging.getLogger(__name__)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+# Shared expiry times are wall-clock; differences below this are clock jitter, not a newer entry
+SHARED_CLOCK_SLACK = 1.0
+
+
+def approx_size(value: Any) -> int:
+    """Rough in-memory size of a JSON-like value, in bytes."""
+    if isinstance(value, str):
+        return 49 + len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _CacheEntry:
+    __slots__ = ("value", "size", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, size: int, fresh_until: float, stale_until: float):
+        self.value = value
+        self.size = size
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class SearchResultCache:
+    """Bounded in-process cache for search results.
+
+    Entries are fresh for ``ttl`` seconds and may then be served stale for
+    another ``stale_ttl`` seconds while a background refresh runs. The
+    least recently used entries are evicted once either ``max_entries``
+    or the approximate ``max_bytes`` budget is exceeded.
+
+    With a ``shared`` state backend, entries are also written there as JSON
+    and local misses are filled from it, so workers reuse each other's
+    results instead of each fetching them again. Shared reads and writes go
+    through ``shared.run``, so a busy SQLite file never blocks the event loop;
+    that makes get, fresh_for and set coroutines.
+
+    Partial results (values whose ``complete`` is False, see
+    SearchResults) are kept for ``partial_ttl`` seconds in this process
+    only, with no stale period, and never replace a usable complete entry.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic,
+        shared=None,
+        namespace: str = "search",
+        partial_ttl: Optional[float] = None
+    ):
+        self.ttl = settings.search_cache_ttl_seconds if ttl is None else ttl
+        self.stale_ttl = settings.search_cache_stale_seconds if stale_ttl is None else stale_ttl
+        self.partial_ttl = settings.search_cache_partial_ttl_seconds if partial_ttl is None else partial_ttl
+        self.max_entries = max_entries or settings.search_cache_max_entries
+        self.max_bytes = max_bytes or settings.search_cache_max_bytes
+        self._timer = timer
+        self.shared = shared
+        self.namespace = namespace
+        self._entries = LRUCache(maxsize=self.max_bytes, getsizeof=lambda entry: entry.size)
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable) -> Tuple[Any, str]:
+        """Return ``(value, state)`` where state is fresh, stale or miss."""
+        entry = self._entries.get(key)
+        if self.shared is not None and (entry is None or self._timer() >= entry.fresh_until):
+            # Another worker may already hold a fresher copy
+            entry = await self._load_shared(key, entry)
+        now = self._timer()
+        if entry is None:
+            return None, MISS
+        if now < entry.fresh_until:
+            return entry.value, FRESH
+        if now < entry.stale_until:
+            return entry.value, STALE
+        self._entries.pop(key, None)
+        return None, MISS
+
+    async def fresh_for(self, key: Hashable) -> float:
+        """Seconds until ``key`` stops being fresh; 0 when stale or missing."""
+        entry = self._entries.get(key)
+        if self.shared is not None and (entry is None or self._timer() >= entry.fresh_until):
+            entry = await self._load_shared(key, entry)
+        return max(0.0, entry.fresh_until - self._timer()) if entry is not None else 0.0
+
+    async def set(self, key: Hashable, value: Any):
+        if getattr(value, "complete", True) is False:
+            self._store_partial(key, value)
+            return
+        self._store(key, value, self.ttl, self.ttl + self.stale_ttl)
+        if self.shared is not None:
+            await self.shared.run(self._save_shared, key, value)
+
+    def _store_partial(self, key: Hashable, value: Any):
+        entry = self._entries.get(key)
+        if entry is not None and self._timer() < entry.stale_until and getattr(entry.value, "complete", True):
+            return  # a stale complete result beats a fresh partial one
+        if self.partial_ttl > 0:
+            self._store(key, value, self.partial_ttl, self.partial_ttl)
+        else:
+            self._entries.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, fresh_for: float, stale_for: float) -> Optional[_CacheEntry]:
+        entry_size = approx_size(value)
+        if entry_size > self.max_bytes:
+            logger.warning(f"Result too large to cache: ~{entry_size} bytes")
+            self._entries.pop(key, None)
+            return None
+        if key not in self._entries:
+            while len(self._entries) >= self.max_entries:
+                self._entries.popitem()
+        now = self._timer()
+        entry = self._entries[key] = _CacheEntry(value, entry_size, now + fresh_for, now + stale_for)
+        return entry
+
+    def _shared_key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{json.dumps(key, default=str)}"
+
+    def _save_shared(self, key: Hashable, value: Any):
+        # Runs in shared.run; expiry travels as wall-clock time, since monotonic clocks differ per process
+        now = time.time()
+        try:
+            payload = json.dumps({"v": value, "f": now + self.ttl, "s": now + self.ttl + self.stale_ttl})
+            self.shared.set(self._shared_key(key), payload.encode(), ttl=self.ttl + self.stale_ttl)
+        except (SharedStateError, TypeError, ValueError) as e:
+            logger.error(f"Failed to write shared cache entry: {str(e)}")
+
+    def _read_shared(self, key: Hashable) -> Optional[Dict]:
+        # Runs in shared.run, so it must not touch the local entries
+        try:
+            raw = self.shared.get(self._shared_key(key))
+            return json.loads(raw) if raw is not None else None
+        except (SharedStateError, ValueError) as e:
+            logger.error(f"Failed to read shared cache entry: {str(e)}")
+            return None
+
+    async def _load_shared(self, key: Hashable, entry: Optional[_CacheEntry]) -> Optional[_CacheEntry]:
+        """The shared copy of ``key`` if it is fresher than the local ``entry``, else ``entry``.
+
+        Keeping the local entry when the shared one is no fresher keeps its
+        list, and so the filter columns built for it, across lookups.
+        """
+        payload = await self.shared.run(self._read_shared, key)
+        if payload is None:
+            return entry
+        now = time.time()
+        if payload["s"] <= now:
+            return entry
+        fresh_for = payload["f"] - now
+        if entry is not None and fresh_for <= entry.fresh_until - self._timer() + SHARED_CLOCK_SLACK:
+            return entry
+        self.shared_hits += 1
+        return self._store(key, payload["v"], fresh_for, payload["s"] - now) or entry
+
+    async def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+        if self.shared is not None:
+            await self.shared.run(self._delete_shared, key)
+
+    def _delete_shared(self, key: Hashable):
+        try:
+            self.shared.delete(self._shared_key(key))
+        except SharedStateError as e:
+            logger.error(f"Failed to drop shared cache entry: {str(e)}")
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve ``key`` from cache, calling ``fetch`` on a miss.
+
+        A stale entry is returned immediately and refreshed in the background.
+        """
+        value, state = await self.get(key)
+        if state == FRESH:
+            self.hits += 1
+            return value
+        if state == STALE:
+            self.stale_hits += 1
+            self._schedule_refresh(key, fetch)
+            return value
+
+        self.misses += 1
+        value = await fetch()
+        await self.set(key, value)
+        return value
+
+    def fill(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        """Count a miss and store ``fetch``'s result in the background.
+
+        For callers that stream the same upstream fetch themselves.
+        """
+        self.misses += 1
+        self._schedule_refresh(key, fetch)
+
+    def _schedule_refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            await self.set(key, await fetch())
+            self.refreshes += 1
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.error(f"Background cache refresh failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "approx_bytes": self._entries.currsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "shared": self.shared is not None,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "refreshing": len(self._refreshing)
+        }
@@ -1,9 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Tuple
+import asyncio
+import httpx
+import math
+from typing import AsyncIterator, Callable, List, Dict, Optional, Tuple, Union
 from datetime import datetime
 import logging
+import time
 from app.models.unlisted_ad import VideoCategory
+from app.config.settings import settings
+from app.services.filmot_parser import (
+    extract_channel_page_videos,
+    extract_page_videos,
+    extract_video_data,
+    parse_duration_to_seconds
+)
+from app.services.parse_executor import ParseExecutor
+from app.services.video_index import ADS_MAX_DURATION_SECONDS, IndexWriter, VideoIndex
+from app.utils.metrics import PARSE_DURATION, ROWS_EXTRACTED, UPSTREAM_ERRORS, UPSTREAM_REQUEST_DURATION
+from app.utils import profiling
+from app.utils.singleflight import Flight, Publish, SingleFlight
 from fastapi import HTTPException
 
 # Configure logging
@@ -34,18 +48,102 @@ YOUTUBE_CATEGORIES = {
     "Travel & Events": "19"
 }
 
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive'
+}
+
+class SearchResults(list):
+    """Videos found by a search, plus the result pages that could not be fetched.
+
+    A search skips pages that fail (403s, HTTP and transport errors) and
+    returns what the other pages held, so non-empty ``failures`` means the
+    list is partial and should not be cached as a normal result.
+    """
+
+    def __init__(self, videos=(), failures: Optional[List[str]] = None):
+        super().__init__(videos)
+        self.failures: List[str] = [] if failures is None else failures
+
+    @property
+    def complete(self) -> bool:
+        return not self.failures
+
+
+class IncompleteSearchError(Exception):
+    """Raised to streaming callers after the last page when some pages failed."""
+
+    def __init__(self, failures: List[str]):
+        super().__init__(f"{len(failures)} result page(s) could not be fetched: {'; '.join(failures)}")
+        self.failures = failures
+
+
 class UnlistedVideoFinder:
-    def __init__(self):
-        self.base_url = "https://filmot.com/unlistedSearch"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive'
-        })
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        parse_executor: Optional[ParseExecutor] = None,
+        index: Optional[VideoIndex] = None
+    ):
+        self.base_url = settings.filmot_base_url
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self.parse_executor = parse_executor or ParseExecutor()
+        self.index = index
+        self._index_writer = IndexWriter(index) if index is not None else None
+        self._searches = SingleFlight()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client, created on first use and shared by all searches."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=httpx.Timeout(
+                    settings.filmot_timeout_seconds,
+                    connect=settings.filmot_connect_timeout_seconds
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.filmot_max_connections,
+                    max_keepalive_connections=settings.filmot_max_keepalive_connections,
+                    keepalive_expiry=settings.filmot_keepalive_expiry_seconds
+                ),
+                follow_redirects=True,
+                transport=self._transport
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client, finish indexing and stop the parse workers."""
+        if self._index_writer is not None:
+            await self._index_writer.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.parse_executor.shutdown()
 
 
+    @staticmethod
+    def query_key(
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        pages: int = 2,
+        ads_only: bool = True,
+        limit: Optional[int] = None
+    ) -> Tuple:
+        """Normalized identity of a search, used for caching and coalescing."""
+        return (
+            ' '.join(keyword.lower().split()) if keyword else None,
+            category or None,
+            channel_id.strip() if channel_id else None,
+            None if limit else pages,
+            ads_only,
+            limit
+        )
+
     def _get_category_id(self, category_name: str) -> Optional[str]:
         """Convert category name to ID."""
         try:
@@ -65,105 +163,190 @@ class UnlistedVideoFinder:
             return False
 
     def _parse_duration_to_seconds(self, duration: str) -> int:
-        """Convert duration string to seconds.
-        Handles formats:
-        - HHhMMmSSs 
-        - MMmSSs
-        - SSs
+        """Convert duration string to seconds."""
+        return parse_duration_to_seconds(duration)
+
+    def _start_page_fetches(self, params: Dict, first_page: int, last_page: int) -> List[asyncio.Task]:
+        """Start fetching result pages first_page..last_page concurrently.
+
+        At most ``settings.filmot_page_concurrency`` requests are in flight at
+        once. Tasks are returned in page order.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.filmot_page_concurrency))
+
+        async def fetch(page: int) -> httpx.Response:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await self.client.get(self.base_url, params={**params, 'page': page})
+                except httpx.TimeoutException:
+                    UPSTREAM_ERRORS.inc("filmot", "timeout")
+                    raise
+                except httpx.HTTPError:
+                    UPSTREAM_ERRORS.inc("filmot", "transport")
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - start
+                    UPSTREAM_REQUEST_DURATION.observe(elapsed, "filmot")
+                    profiling.record("fetch", elapsed)
+                if response.status_code >= 400:
+                    UPSTREAM_ERRORS.inc("filmot", f"http_{response.status_code}")
+                return response
+
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(first_page, last_page + 1)]
+        for task in tasks:
+            # Pages abandoned by an early exit must not log "exception never retrieved"
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return tasks
+
+    async def _iter_page_responses(
+        self,
+        params: Dict,
+        pages: int,
+        wave_size: Optional[Callable[[int], int]] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, Union[httpx.Response, Exception]]]:
+        """Yield ``(page, response)`` in page order as each page arrives.
+
+        Pages are requested in waves of ``wave_size(pages_fetched_so_far)``
+        pages (all at once by default); the next wave only starts once the
+        caller has consumed the previous one, and none starts after the
+        event-loop time ``deadline``. A page
+        that failed to fetch is yielded as its exception so callers can handle
+        it per page. Outstanding fetches are cancelled on early exit.
         """
+        loop = asyncio.get_running_loop()
+        next_page = 1
+        tasks = []
         try:
-            # Clean the duration string and remove special characters
-            duration = duration.replace('▼', '').replace('▲', '').strip()
-            if not duration:
-                return 0
-
-            # Initialize counters
-            hours = 0
-            minutes = 0
-            seconds = 0
-
-            # Split into components and process
-            components = duration.lower().split()
-            for component in components:
-                if 'h' in component:
-                    hours = int(''.join(filter(str.isdigit, component)))
-                elif 'm' in component:
-                    minutes = int(''.join(filter(str.isdigit, component)))
-                elif 's' in component:
-                    seconds = int(''.join(filter(str.isdigit, component)))
-
-            # Calculate total seconds
-            total_seconds = (hours * 3600) + (minutes * 60) + seconds
-            # logger.debug(f"Parsed duration '{duration}' -> {total_seconds} seconds [h:{hours} m:{minutes} s:{seconds}]")
-            return total_seconds
+            while next_page <= pages:
+                if deadline is not None and loop.time() >= deadline:
+                    logger.warning(f"Search deadline reached before page {next_page}")
+                    return
+                size = wave_size(next_page - 1) if wave_size else pages
+                last_page = min(pages, next_page + max(1, size) - 1)
+                tasks = self._start_page_fetches(params, next_page, last_page)
+                for page, task in enumerate(tasks, start=next_page):
+                    try:
+                        response = await task
+                    except Exception as e:
+                        response = e
+                    yield page, response
+                next_page = last_page + 1
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        except Exception as e:
-            # logger.debug(f"Error parsing duration '{duration}': {str(e)}")
-            return 0
+    async def _parse_page(self, page_type: str, extract, html: str) -> Optional[List[Dict]]:
+        """Run ``extract`` on a page in the parse executor, recording its cost."""
+        start = time.perf_counter()
+        page_videos = await self.parse_executor.run(extract, html)
+        elapsed = time.perf_counter() - start
+        PARSE_DURATION.observe(elapsed, page_type)
+        profiling.record("parse", elapsed)
+        if page_videos:
+            ROWS_EXTRACTED.inc(page_type, amount=len(page_videos))
+        return page_videos
 
-    async def fetch_channel_videos(self, channel_id: str, pages: int = 2) -> List[Dict]:
-        """Fetch videos from a specific channel."""
+    def _index_videos(self, videos: List[Dict]):
+        """Queue a page of results for the local index, if there is one; never blocks."""
+        if self._index_writer is not None:
+            self._index_writer.add(videos)
+
+    def _page_budget(self, pages: int, limit: Optional[int], found: Callable[[], int]) -> Dict:
+        """Paging arguments for _iter_page_responses.
+
+        Without a limit, exactly ``pages`` pages are fetched at once. With a
+        limit, waves are fetched until the limit, the page cap or the
+        deadline is reached. Each wave is sized to the videos still missing
+        (``found()`` returns how many the caller has so far): the first
+        assumes full pages of ``filmot_rows_per_page`` rows, later ones the
+        rate seen so far, and none exceeds ``filmot_page_concurrency``. So a
+        limit one page covers costs one request.
+        """
+        if not limit:
+            return {'pages': pages}
+        cap = max(1, settings.filmot_page_concurrency)
+
+        def wave_size(fetched: int) -> int:
+            per_page = found() / fetched if fetched else settings.filmot_rows_per_page
+            if per_page <= 0:
+                return min(cap, fetched)  # nothing matched yet: double the pages fetched
+            return min(cap, math.ceil((limit - found()) / per_page))
+
+        return {
+            'pages': settings.filmot_max_pages,
+            'wave_size': wave_size,
+            'deadline': asyncio.get_running_loop().time() + settings.filmot_search_deadline_seconds
+        }
+
+    async def iter_channel_videos(
+        self, channel_id: str, pages: int = 2, limit: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield a channel's videos page by page, in page order, as each page is parsed.
+
+        With ``limit``, stops as soon as that many videos have been yielded.
+        """
         try:
             params = {
                 'sortField': 'viewcount',
                 'sortOrder': 'desc',
                 'channelID': channel_id
             }
-            
-            results = []
-            
-            for page in range(1, pages + 1):
-                params['page'] = page
-                response = self.session.get(self.base_url, params=params)
-                response.raise_for_status()
-                
-                if not response.text:
-                    continue
+
+            found = 0
+            page_responses = self._iter_page_responses(params, **self._page_budget(pages, limit, lambda: found))
+            try:
+                async for page, response in page_responses:
+                    if isinstance(response, Exception):
+                        raise response
+                    response.raise_for_status()
                     
-                soup = BeautifulSoup(response.text, "html.parser")
-                rows = soup.find_all('tr')
-                
-                channel_info = None
-                for row in rows:
-                    try:
-                        # Get channel info from first valid row
-                        if not channel_info:
-                            channel_td = row.find('td', {'dth': 'Channel'})
-                            if channel_td:
-                                channel_info = {
-                                    'name': channel_td.find('a').text.strip(),
-                                    'channel_id': channel_td.find('a')['href'].split('/')[-1],
-                                    'subscribers': channel_td.find('small').text.strip() if channel_td.find('small') else "Unknown"
-                                }
-                        
-                        video_data = self._extract_video_data(row)
-                        if video_data:
-                            if channel_info:
-                                video_data.update({
-                                    'channel_info': channel_info
-                                })
-                            results.append(video_data)
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing row: {str(e)}")
+                    if not response.text:
                         continue
                         
-            return results
+                    page_videos = await self._parse_page("channel", extract_channel_page_videos, response.text)
+                    if limit:
+                        if not page_videos:
+                            break  # past the channel's last page
+                        page_videos = page_videos[:limit - found]
+                    found += len(page_videos)
+                    try:
+                        yield page_videos
+                    finally:
+                        # Queued after the page is handed out, even if the caller stops here
+                        self._index_videos(page_videos)
+                    if limit and found >= limit:
+                        break
+            finally:
+                await page_responses.aclose()
             
         except Exception as e:
             logger.error(f"Error fetching channel videos: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def fetch_channel_videos(self, channel_id: str, pages: int = 2, limit: Optional[int] = None) -> List[Dict]:
+        """Fetch videos from a specific channel."""
+        results = []
+        async for page_videos in self.iter_channel_videos(channel_id, pages, limit):
+            results.extend(page_videos)
+        return results
+
     async def search_unlisted_videos(
         self, 
         keyword: Optional[str] = None, 
         category: Optional[str] = None, 
         channel_id: Optional[str] = None,
         pages: int = 2,
-        ads_only: bool = True
-    ) -> List[Dict]:
+        ads_only: bool = True,
+        limit: Optional[int] = None
+    ) -> SearchResults:
         """
         Search for unlisted videos with filters.
+
+        Concurrent searches with the same normalized query share one
+        upstream fetch and receive the same result list. Pages that fail
+        are skipped and listed in the result's ``failures``.
         
         Args:
             keyword: Search term
@@ -172,21 +355,109 @@ class UnlistedVideoFinder:
             max_duration: Maximum duration in seconds (default 60 for ads)
             pages: Number of pages to fetch
             ads_only: Filter for short videos (default False)
+            limit: Fetch pages until this many videos pass the filters,
+                up to settings.filmot_max_pages or the search deadline
+                (``pages`` is then ignored)
+        """
+        return await self._shared_search(keyword, category, channel_id, pages, ads_only, limit).result()
+
+    def follow_unlisted_videos(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        pages: int = 2,
+        ads_only: bool = True,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield a search's videos page by page as they arrive.
+
+        Shares the upstream fetch with concurrent search_unlisted_videos and
+        follow_unlisted_videos calls for the same query. Raises
+        IncompleteSearchError after the last page if some pages failed.
+        """
+        return self._follow_search(self._shared_search(keyword, category, channel_id, pages, ads_only, limit))
+
+    def _shared_search(self, keyword, category, channel_id, pages, ads_only, limit) -> Flight:
+        """The in-flight search for this query, started if there is none.
+
+        The key is forgotten as soon as the search completes, so results are
+        never served after the fact; caching is the caller's job.
         """
+        key = self.query_key(keyword, category, channel_id, pages, ads_only, limit)
+        return self._searches.join(
+            key,
+            lambda publish: self._search_unlisted_videos(
+                keyword, category, channel_id, pages, ads_only, limit, publish
+            )
+        )
+
+    async def _follow_search(self, search: Flight) -> AsyncIterator[List[Dict]]:
+        async for page_videos in search.follow():
+            yield page_videos
+        results = search.task.result()
+        if not results.complete:
+            raise IncompleteSearchError(results.failures)
+
+    async def _search_unlisted_videos(
+        self,
+        keyword: Optional[str],
+        category: Optional[str],
+        channel_id: Optional[str],
+        pages: int,
+        ads_only: bool,
+        limit: Optional[int],
+        publish: Publish
+    ) -> SearchResults:
+        results = SearchResults()
+        async for page_videos in self.iter_unlisted_videos(
+            keyword, category, channel_id, pages, ads_only, limit, failures=results.failures
+        ):
+            results.extend(page_videos)
+            publish(page_videos)
+        if not results.complete:
+            logger.warning(f"Search returned partial results: {'; '.join(results.failures)}")
+        elif self._index_writer is not None:
+            key = self.query_key(keyword, category, channel_id, pages, ads_only, limit)
+            self._index_writer.mark_fetched(key, len(results))
+        return results
+
+    async def iter_unlisted_videos(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        pages: int = 2,
+        ads_only: bool = True,
+        limit: Optional[int] = None,
+        failures: Optional[List[str]] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Yield matching videos page by page, in page order, as soon as each
+        page is parsed. Takes the same arguments as search_unlisted_videos.
+
+        Pages that fail after some results were found are skipped; each is
+        described in ``failures``, when given, so callers can tell a
+        complete result from a partial one.
+        """
+        failures = [] if failures is None else failures
         if channel_id:
-            return await self.fetch_channel_videos(channel_id, pages)
+            async for page_videos in self.iter_channel_videos(channel_id, pages, limit):
+                yield page_videos
+            return
 
         if category and not self._validate_category(category):
             raise ValueError(f"Invalid category: {category}. Please use one of: {[c.value for c in VideoCategory]}")
         
-        results = []
+        found = 0
         try:
             # Build search parameters
             params = {
                 'sortField': 'viewcount',
-                'sortOrder': 'desc',
-                'videoDuration': 'short' if ads_only else None  # Add duration filter
+                'sortOrder': 'desc'
             }
+            if ads_only:
+                params['videoDuration'] = 'short'  # Add duration filter
             
             if keyword:
                 params['titleQuery'] = keyword
@@ -194,124 +465,92 @@ class UnlistedVideoFinder:
                 category_id = self._get_category_id(category)
                 if category_id:
                     params['category'] = category_id
-            if channel_id:
-                params['channelID'] = channel_id
 
-            # Fetch pages
-            for page in range(1, pages + 1):
-                params['page'] = page
-                try:
-                    response = self.session.get(self.base_url, params=params)
-                    if response.status_code == 403:
-                        logger.error(f"Access forbidden for page {page}: {response.url}")
-                        continue
-                    response.raise_for_status()
+            # Pages are fetched concurrently and handled in page order
+            page_responses = self._iter_page_responses(params, **self._page_budget(pages, limit, lambda: found))
+            try:
+                async for page, response in page_responses:
+                    results = []
+                    try:
+                        if isinstance(response, Exception):
+                            raise response
+                        if response.status_code == 403:
+                            logger.error(f"Access forbidden for page {page}: {response.url}")
+                            failures.append(f"page {page}: HTTP 403")
+                            continue
+                        response.raise_for_status()
                     
-                    if not response.text:
-                        logger.error("Empty response received from server")
-                        raise HTTPException(status_code=500, detail="Empty response from server")
+                        if not response.text:
+                            logger.error("Empty response received from server")
+                            raise HTTPException(status_code=500, detail="Empty response from server")
 
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    table = soup.find('table', class_="table border border-primary table-striped resp-tbl")
-                    
-                    if not table or not table.find('tbody'):
-                        logger.warning(f"No results found for page {page}")
-                        continue
-                        
-                    rows = table.find('tbody').find_all('tr')
-                    if not rows:
-                        logger.warning(f"No video rows found on page {page}")
-                        continue
+                        page_videos = await self._parse_page("search", extract_page_videos, response.text)
+                        if page_videos is None:
+                            logger.warning(f"No results found for page {page}")
+                            if limit:
+                                break  # past the last page of results
+                            continue
 
-                    for row in rows:
-                        try:
-                            video_data = self._extract_video_data(row)
-                            if video_data:
-                                duration_seconds = video_data.get('duration_seconds', 0)
-                                # Skip videos longer than 120 seconds (2 minutes) for ads
-                                if ads_only and duration_seconds > 120:
-                                    # logger.debug(f"Skipping long video: {duration_seconds}s > 120s")
-                                    continue
-                                
-                                # Validate required fields
-                                if all(key in video_data for key in ['title', 'video_id', 'channel_name']):
-                                    results.append(video_data)
-                                else:
-                                    logger.warning(f"Skipping video due to missing fields: {video_data.get('video_id', 'unknown')}")
-                        except Exception as row_err:
-                            logger.error(f"Error processing row: {str(row_err)}")
+                        if not page_videos:
+                            logger.warning(f"No video rows found on page {page}")
                             continue
 
-                except requests.RequestException as e:
-                    logger.error(f"Error fetching page {page}: {str(e)}")
-                    if not results:  # Only raise if we have no results at all
-                        raise HTTPException(status_code=503, detail=f"Error fetching results: {str(e)}")
-                    continue
+                        for video_data in page_videos:
+                            try:
+                                if video_data:
+                                    duration_seconds = video_data.get('duration_seconds', 0)
+                                    # Skip videos longer than 120 seconds (2 minutes) for ads
+                                    if ads_only and duration_seconds > ADS_MAX_DURATION_SECONDS:
+                                        # logger.debug(f"Skipping long video: {duration_seconds}s > 120s")
+                                        continue
+                                
+                                    # Validate required fields
+                                    if all(key in video_data for key in ['title', 'video_id', 'channel_name']):
+                                        results.append(video_data)
+                                    else:
+                                        logger.warning(f"Skipping video due to missing fields: {video_data.get('video_id', 'unknown')}")
+                            except Exception as row_err:
+                                logger.error(f"Error processing row: {str(row_err)}")
+                                continue
 
-            if not results:
+                    except httpx.HTTPError as e:
+                        logger.error(f"Error fetching page {page}: {str(e)}")
+                        if not found:  # Only raise if we have no results at all
+                            raise HTTPException(status_code=503, detail=f"Error fetching results: {str(e)}")
+                        if isinstance(e, httpx.HTTPStatusError):
+                            failures.append(f"page {page}: HTTP {e.response.status_code}")
+                        else:
+                            failures.append(f"page {page}: {str(e) or type(e).__name__}")
+                        continue
+
+                    if limit:
+                        results = results[:limit - found]
+                    if results:
+                        found += len(results)
+                        try:
+                            yield results
+                        finally:
+                            self._index_videos(results)
+                    if limit and found >= limit:
+                        break
+            finally:
+                await page_responses.aclose()
+
+            if not found:
                 logger.warning("No videos found matching criteria")
-                return []
+                return
 
-            logger.info(f"Successfully found {len(results)} videos")
-            return results
+            logger.info(f"Successfully found {found} videos")
 
         except Exception as e:
             logger.error(f"Search error: {str(e)}")
-            if not results:
+            if not found:
                 raise HTTPException(status_code=500, detail=str(e))
-            return results
+            failures.append(f"search stopped early: {getattr(e, 'detail', str(e))}")
 
     def _extract_video_data(self, row) -> Optional[Dict]:
         """Extract video data from a table row."""
-        try:
-            title_td = row.find('td', {'dth': 'Title'})
-            channel_td = row.find('td', {'dth': 'Channel'})
-            
-            if not title_td or not channel_td:
-                logger.warning("Missing required TD elements")
-                return None
-
-            video_link = title_td.find('a')
-            if not video_link or 'href' not in video_link.attrs:
-                logger.warning("Missing video link")
-                return None
-
-            duration_td = row.find('td', {'dth': 'Duration'})
-            duration = duration_td.text.strip() if duration_td else "0:00"
-            duration_seconds = self._parse_duration_to_seconds(duration)
-            # print(f"Parsed duration: {duration} -> {duration_seconds} seconds")
-
-            result = {
-                'title': title_td.find('a').text.strip(),
-                'video_id': video_link['href'].split('=')[-1],
-                'url': video_link['href'],
-                'thumbnail': title_td.find('img', class_='lozad')['data-src'] if title_td.find('img', class_='lozad') else "",
-                'channel_name': channel_td.find('a').text.strip(),
-                'channel_id': channel_td.find('a')['href'].split('/')[-1],
-                'subscribers': channel_td.find('small').text.strip() if channel_td.find('small') else "Unknown",
-                'category': row.find('td', {'dth': 'Category'}).find('a').text.strip() if row.find('td', {'dth': 'Category'}) else "Unknown",
-                'duration': duration,
-                'duration_seconds': duration_seconds,
-                'views': row.find('td', {'dth': 'Views'}).text.strip() if row.find('td', {'dth': 'Views'}) else "0",
-                'likes': row.find('td', {'dth': 'Likes'}).text.strip() if row.find('td', {'dth': 'Likes'}) else "0",
-                'dislikes': row.find('td', {'dth': 'Dislikes'}).text.strip() if row.find('td', {'dth': 'Dislikes'}) else "0",
-                'upload_date': row.find('td', {'dth': 'Uploaded'}).text.strip() if row.find('td', {'dth': 'Uploaded'}) else "Unknown",
-                'languages': {
-                    'auto_generated': [img['title'] for img in row.find('td', {'dth': 'Auto-Generated'}).find_all('img')] if row.find('td', {'dth': 'Auto-Generated'}) else [],
-                    'subtitles': [img['title'] for img in row.find('td', {'dth': 'Subtitles'}).find_all('img')] if row.find('td', {'dth': 'Subtitles'}) else []
-                }
-            }
-
-            # Validate required fields
-            if not all(result.get(field) for field in ['title', 'video_id', 'channel_name']):
-                logger.warning("Missing required fields in extracted data")
-                return None
-
-            return result
-
-        except Exception as e:
-            logger.error(f"Error extracting video data: {str(e)}")
-            return None
+        return extract_video_data(row)
 
     def get_available_categories(self) -> List[str]:
         """Return list of available category names."""
@@ -0,0 +1,244 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Same cut-off as UnlistedVideoFinder's ads_only filter
+ADS_MAX_DURATION_SECONDS = 120
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS videos ("
+    "rowid INTEGER PRIMARY KEY, video_id TEXT NOT NULL UNIQUE, title TEXT NOT NULL, "
+    "channel_name TEXT NOT NULL, channel_id TEXT, category TEXT, duration_seconds INTEGER, "
+    "views_count INTEGER, data TEXT NOT NULL, indexed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS videos_category ON videos (category, views_count)",
+    "CREATE INDEX IF NOT EXISTS videos_channel_id ON videos (channel_id, views_count)",
+    "CREATE INDEX IF NOT EXISTS videos_duration ON videos (duration_seconds)",
+    "CREATE INDEX IF NOT EXISTS videos_views ON videos (views_count)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5("
+    "title, channel_name, content='videos', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+    # External-content FTS table kept in step with videos by triggers
+    "CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN "
+    "INSERT INTO videos_fts (rowid, title, channel_name) VALUES (new.rowid, new.title, new.channel_name); END",
+    "CREATE TRIGGER IF NOT EXISTS videos_ad AFTER DELETE ON videos BEGIN "
+    "INSERT INTO videos_fts (videos_fts, rowid, title, channel_name) "
+    "VALUES ('delete', old.rowid, old.title, old.channel_name); END",
+    "CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE OF title, channel_name ON videos BEGIN "
+    "INSERT INTO videos_fts (videos_fts, rowid, title, channel_name) "
+    "VALUES ('delete', old.rowid, old.title, old.channel_name); "
+    "INSERT INTO videos_fts (rowid, title, channel_name) VALUES (new.rowid, new.title, new.channel_name); END",
+    "CREATE TABLE IF NOT EXISTS queries ("
+    "key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, count INTEGER NOT NULL)"
+]
+
+UPSERT = (
+    "INSERT INTO videos (video_id, title, channel_name, channel_id, category, duration_seconds, "
+    "views_count, data, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (video_id) DO UPDATE SET title = excluded.title, channel_name = excluded.channel_name, "
+    "channel_id = excluded.channel_id, category = excluded.category, "
+    "duration_seconds = excluded.duration_seconds, views_count = excluded.views_count, "
+    "data = excluded.data, indexed_at = excluded.indexed_at"
+)
+
+
+class VideoIndexError(Exception):
+    """Raised when the local video index cannot be read or written."""
+
+
+def match_expression(keyword: str) -> Optional[str]:
+    """FTS5 query matching every word of ``keyword``, as literal terms."""
+    terms = keyword.split()
+    if not terms:
+        return None
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class VideoIndex:
+    """On-disk index of every unlisted video scraped from filmot.
+
+    Rows are upserted by video id as searches return them, so the index
+    grows with use and always holds the latest scraped values. Titles and
+    channel names are full-text indexed with FTS5; category, channel id,
+    duration and views have B-tree indexes. The database runs in WAL mode
+    and is shared by every worker on the host. Connections are per thread.
+    """
+
+    def __init__(self, path: Optional[str] = None, timer=time.time):
+        self.path = path or settings.video_index_path
+        self._timer = timer
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, videos: Iterable[Dict]) -> int:
+        """Insert or refresh ``videos`` by video id; returns the number written."""
+        now = self._timer()
+        rows = [
+            (
+                video["video_id"], video["title"], video["channel_name"], video.get("channel_id"),
+                video.get("category"), video.get("duration_seconds"), video.get("views_count"),
+                json.dumps(video), now
+            )
+            for video in videos
+            if video.get("video_id")
+        ]
+        if not rows:
+            return 0
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(UPSERT, rows)
+        except sqlite3.Error as e:
+            raise VideoIndexError(str(e)) from e
+        return len(rows)
+
+    @staticmethod
+    def _query_key(key: Hashable) -> str:
+        return json.dumps(key, default=str)
+
+    def mark_fetched(self, key: Hashable, count: int):
+        """Record that the search ``key`` (a finder query key) was just fetched from filmot."""
+        try:
+            self._connection().execute(
+                "INSERT INTO queries (key, fetched_at, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET fetched_at = excluded.fetched_at, count = excluded.count",
+                (self._query_key(key), self._timer(), count)
+            )
+        except sqlite3.Error as e:
+            raise VideoIndexError(str(e)) from e
+
+    def fetched_age(self, key: Hashable) -> Optional[float]:
+        """Seconds since the search ``key`` was last fetched from filmot, or None."""
+        try:
+            row = self._connection().execute(
+                "SELECT fetched_at FROM queries WHERE key = ?", (self._query_key(key),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise VideoIndexError(str(e)) from e
+        return self._timer() - row[0] if row else None
+
+    def search(
+        self,
+        keyword: Optional[str] = None,
+        category: Optional[str] = None,
+        channel_id: Optional[str] = None,
+        ads_only: bool = True,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Indexed videos matching the search, most viewed first.
+
+        ``keyword`` matches every word against titles and channel names.
+        """
+        clauses, params = [], []
+        source = "videos v"
+        match = match_expression(keyword) if keyword else None
+        if match:
+            source = "videos_fts f JOIN videos v ON v.rowid = f.rowid"
+            clauses.append("videos_fts MATCH ?")
+            params.append(match)
+        if category:
+            clauses.append("v.category = ?")
+            params.append(category)
+        if channel_id:
+            clauses.append("v.channel_id = ?")
+            params.append(channel_id.strip())
+        if ads_only:
+            clauses.append("v.duration_seconds <= ?")
+            params.append(ADS_MAX_DURATION_SECONDS)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit or settings.video_index_search_limit)
+        try:
+            rows = self._connection().execute(
+                f"SELECT v.data FROM {source} {where} ORDER BY v.views_count DESC LIMIT ?", params
+            ).fetchall()
+        except sqlite3.Error as e:
+            raise VideoIndexError(str(e)) from e
+        return [json.loads(data) for data, in rows]
+
+    def stats(self) -> Dict:
+        try:
+            conn = self._connection()
+            videos = conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            queries = conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        except sqlite3.Error as e:
+            raise VideoIndexError(str(e)) from e
+        return {"videos": videos, "queries": queries, "path": self.path}
+
+
+class IndexWriter:
+    """Writes scraped videos into a VideoIndex from a background task.
+
+    ``add`` and ``mark_fetched`` only queue their work and return, so a busy
+    index database never delays or fails a search. The task writes whatever
+    has queued up since its last write in one upsert, in a worker thread,
+    and then records the fetched searches, so a search is never marked as
+    fetched before its videos are indexed. Failures are logged and dropped;
+    so are new videos while more than ``max_pending`` are waiting.
+    """
+
+    def __init__(self, index: VideoIndex, max_pending: Optional[int] = None):
+        self.index = index
+        self.max_pending = max_pending or settings.video_index_max_pending
+        self._videos: List[Dict] = []
+        self._fetched: List[Tuple[Hashable, int]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def add(self, videos: List[Dict]):
+        if not videos:
+            return
+        if len(self._videos) >= self.max_pending:
+            self.dropped += len(videos)
+            logger.warning(f"Index writer is behind, dropping {len(videos)} videos")
+            return
+        self._videos.extend(videos)
+        self._schedule()
+
+    def mark_fetched(self, key: Hashable, count: int):
+        self._fetched.append((key, count))
+        self._schedule()
+
+    def _schedule(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        # Work queued during a write is picked up by the next one
+        while self._videos or self._fetched:
+            await self._write()
+
+    async def _write(self):
+        videos, self._videos = self._videos, []
+        fetched, self._fetched = self._fetched, []
+        try:
+            if videos:
+                await asyncio.to_thread(self.index.upsert, videos)
+            for key, count in fetched:
+                await asyncio.to_thread(self.index.mark_fetched, key, count)
+        except VideoIndexError as e:
+            logger.warning(f"Could not write {len(videos)} videos to the local index: {str(e)}")
+
+    async def aclose(self):
+        """Wait until everything queued has been written."""
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+video_index = VideoIndex() if settings.video_index_enabled else None
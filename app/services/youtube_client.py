@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from app.config.settings import settings
+from app.utils import profiling
+from app.utils.metrics import UPSTREAM_ERRORS, UPSTREAM_REQUEST_DURATION
+from typing import Callable, Optional
+import asyncio
+import httplib2
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+_thread_local = threading.local()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _default_http() -> httplib2.Http:
+    return httplib2.Http(timeout=settings.youtube_timeout_seconds)
+
+
+_http_factory: Callable[[], httplib2.Http] = _default_http
+_http_generation = 0
+
+
+def load_discovery_document() -> str:
+    """Return the YouTube Data API v3 discovery document without any network call.
+
+    Uses ``settings.youtube_discovery_document`` when set, otherwise the static
+    copy bundled with the pinned google-api-python-client release.
+    """
+    if settings.youtube_discovery_document:
+        with open(settings.youtube_discovery_document, encoding="utf-8") as f:
+            return f.read()
+    document = get_static_doc("youtube", "v3")
+    if document is None:
+        raise RuntimeError("Bundled YouTube discovery document not found")
+    return document
+
+
+def set_http_factory(factory: Optional[Callable[[], httplib2.Http]] = None):
+    """Replace how per-thread transports are created (None restores the default).
+
+    Lets benchmarks and local stand-ins serve recorded responses.
+    """
+    global _http_factory, _http_generation
+    _http_factory = factory or _default_http
+    _http_generation += 1
+
+
+def get_http() -> httplib2.Http:
+    """HTTP transport for the current thread (httplib2.Http is not thread-safe)."""
+    if getattr(_thread_local, "generation", None) != _http_generation:
+        _thread_local.http = _http_factory()
+        _thread_local.generation = _http_generation
+    return _thread_local.http
+
+
+def get_youtube_client():
+    """Process-wide YouTube Data API client, built on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_from_document(
+                    load_discovery_document(),
+                    developerKey=settings.youtube_api_key,
+                    http=get_http(),
+                    client_options={"api_endpoint": settings.youtube_api_endpoint} if settings.youtube_api_endpoint else None
+                )
+                logger.info("YouTube client built from bundled discovery document")
+    return _client
+
+
+def execute(request):
+    """Execute an API request on the calling thread's own HTTP transport."""
+    return request.execute(http=get_http())
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.youtube_max_workers,
+                thread_name_prefix="youtube"
+            )
+        return _executor
+
+
+async def execute_async(request, timeout: Optional[float] = None):
+    """Execute an API request in the bounded YouTube thread pool.
+
+    Raises asyncio.TimeoutError when no response arrives within ``timeout``
+    seconds (default ``settings.youtube_call_timeout_seconds``). Latency and
+    failures are recorded per API method, e.g. ``youtube.search.list``.
+    """
+    upstream = getattr(request, "methodId", None) or "youtube"
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_get_executor(), execute, request),
+            timeout or settings.youtube_call_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        UPSTREAM_ERRORS.inc(upstream, "timeout")
+        raise
+    except HttpError as e:
+        UPSTREAM_ERRORS.inc(upstream, f"http_{e.resp.status}")
+        raise
+    except Exception:
+        UPSTREAM_ERRORS.inc(upstream, "error")
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        UPSTREAM_REQUEST_DURATION.observe(elapsed, upstream)
+        profiling.record("fetch", elapsed)
+
+
+def shutdown():
+    """Stop the YouTube thread pool; a new one is started on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
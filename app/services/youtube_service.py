@@ -1,23 +1,49 @@
 from calendar import c
-from googleapiclient.discovery import build
+from app.services.youtube_client import get_youtube_client, execute_async
 from google.oauth2.credentials import Credentials
 from app.config.settings import settings
 from app.models.video import Video, VideoMetadata
 from typing import List, Optional, Dict
 from datetime import datetime
+import asyncio
 import logging
+import math
 import json
 import os
 from fastapi import HTTPException
+from app.services.quota import QuotaExceededError, quota_ledger, quota_units
+from app.services.search_cache import MISS, SearchResultCache
+from app.utils.metrics import register_cache
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# videos.list accepts at most 50 comma-separated ids per call
+VIDEOS_LIST_MAX_IDS = 50
+SEARCH_MAX_RESULTS = 50
+
+
+def _search_calls(max_results: int, enrich: bool) -> Dict[str, int]:
+    """The quota calls a search makes: search.list, plus its videos.list enrichment batches."""
+    calls = {"search.list": 1}
+    if enrich:
+        calls["videos.list"] = math.ceil(max_results / VIDEOS_LIST_MAX_IDS)
+    return calls
+
+# Shared across the per-request service instances
+_search_flight = SingleFlight()
+_search_cache = SearchResultCache(
+    ttl=settings.youtube_cache_ttl_seconds,
+    stale_ttl=settings.youtube_cache_stale_seconds
+)
+register_cache("youtube_search", _search_cache)
+
 class YouTubeService:
     def __init__(self):
         try:
             if not settings.youtube_api_key:
                 raise ValueError("YouTube API key is not configured")
-            self.youtube = build('youtube', 'v3', developerKey=settings.youtube_api_key)
+            self.youtube = get_youtube_client()
             logger.info("YouTube service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize YouTube service: {str(e)}")
@@ -29,6 +55,61 @@ class YouTubeService:
                 raise HTTPException(status_code=500, detail="YouTube service initialization failed")
 
     async def search_videos(self, keyword: str = None, category: str = None, channel_name: str = None) -> List[Video]:
+        """Search videos.
+
+        Results are cached and concurrent identical searches share one API
+        call. Once today's quota is down to the configured reserve, cached
+        results are served even when stale; without a cached copy the search
+        runs with fewer results and no statistics enrichment, and once the
+        quota is exhausted it is rejected with 429.
+        """
+        key = tuple(' '.join(value.lower().split()) if value else None for value in (keyword, category, channel_name))
+
+        if await quota_ledger.can_spend(quota_units(_search_calls(SEARCH_MAX_RESULTS, enrich=True))):
+            try:
+                return await _search_cache.get_or_fetch(
+                    key,
+                    lambda: _search_flight.do(key, lambda: self._search_videos(keyword, category, channel_name))
+                )
+            except QuotaExceededError:
+                # Other workers spent the units between the check and the call
+                pass
+
+        cached, state = await _search_cache.get(key)
+        if state != MISS:
+            await quota_ledger.record_degraded("served_from_cache")
+            return cached
+        try:
+            videos = await _search_flight.do(
+                key + ("degraded",),
+                lambda: self._search_videos(
+                    keyword, category, channel_name,
+                    max_results=settings.youtube_degraded_max_results,
+                    enrich=False,
+                    use_reserve=True
+                )
+            )
+        except QuotaExceededError:
+            await quota_ledger.record_rejection("search.list")
+            raise HTTPException(status_code=429, detail="YouTube API quota exceeded")
+        await quota_ledger.record_degraded("skipped_enrichment")
+        return videos
+
+    async def _search_videos(
+        self,
+        keyword: str = None,
+        category: str = None,
+        channel_name: str = None,
+        max_results: int = SEARCH_MAX_RESULTS,
+        enrich: bool = True,
+        use_reserve: bool = False
+    ) -> List[Video]:
+        """Run one search.list call, plus videos.list enrichment when ``enrich``.
+
+        All of it is paid for up front with one ``try_spend``, keeping the
+        quota reserve unless ``use_reserve``; raises QuotaExceededError when
+        it does not fit.
+        """
         try:
             # Input validation
             if not any([keyword, category, channel_name]):
@@ -36,7 +117,7 @@ class YouTubeService:
             
             search_params = {
                 'part': 'snippet',
-                'maxResults': 50,
+                'maxResults': max_results,
                 'type': 'video'
             }
             
@@ -49,12 +130,30 @@ class YouTubeService:
 
             logger.debug(f"Searching videos with params: {search_params}")
             request = self.youtube.search().list(**search_params)
-            response = request.execute()
+            calls = _search_calls(max_results, enrich)
+            if not await quota_ledger.try_spend(calls, use_reserve=use_reserve):
+                raise QuotaExceededError(f"Not enough YouTube quota left for {quota_units(calls)} units")
+            try:
+                response = await execute_async(request)
+            except Exception:
+                # The enrichment paid for with the search will not happen
+                if enrich:
+                    await quota_ledger.refund("videos.list", calls["videos.list"])
+                raise
             
+            items = response.get('items', [])
+            metadata_by_id = {}
+            if enrich:
+                metadata_by_id = await self.get_videos_metadata(
+                    [item['id']['videoId'] for item in items],
+                    prepaid_calls=calls["videos.list"]
+                )
+
             videos = []
-            for item in response.get('items', []):
+            for item in items:
                 video_id = item['id']['videoId']
-                metadata = await self.get_video_metadata(video_id)
+                # Without enrichment statistics are reported as zero
+                metadata = metadata_by_id.get(video_id, {}) if enrich else {'statistics': {}}
                     
                 # Create video object
                 try:
@@ -83,6 +182,11 @@ class YouTubeService:
             logger.info(f"Found {len(videos)} videos matching criteria")
             return videos
             
+        except asyncio.TimeoutError:
+            logger.error("YouTube API request timed out")
+            raise HTTPException(status_code=504, detail="YouTube API request timed out")
+        except QuotaExceededError:
+            raise
         except Exception as e:
             error_msg = str(e).lower()
             if "quota" in error_msg:
@@ -99,10 +203,43 @@ class YouTubeService:
                 part="snippet,contentDetails,statistics",
                 id=video_id
             )
-            response = request.execute()
+            await quota_ledger.charge("videos.list")
+            response = await execute_async(request)
             if response['items']:
                 return response['items'][0]
             return {}
         except Exception as e:
             logger.error(f"Error fetching video metadata: {str(e)}")
             raise Exception(f"Error fetching video metadata: {str(e)}")
+
+    async def get_videos_metadata(self, video_ids: List[str], prepaid_calls: int = 0) -> Dict[str, dict]:
+        """Fetch statistics for many videos, one videos.list call per 50 ids.
+
+        The first ``prepaid_calls`` calls were already paid for by the caller;
+        any it does not need are refunded.
+        """
+        metadata = {}
+        unique_ids = list(dict.fromkeys(video_ids))
+        batches = [
+            unique_ids[start:start + VIDEOS_LIST_MAX_IDS]
+            for start in range(0, len(unique_ids), VIDEOS_LIST_MAX_IDS)
+        ]
+        if prepaid_calls > len(batches):
+            await quota_ledger.refund("videos.list", prepaid_calls - len(batches))
+        for index, batch in enumerate(batches):
+            try:
+                request = self.youtube.videos().list(
+                    part="statistics",
+                    id=",".join(batch)
+                )
+                if index >= prepaid_calls:
+                    await quota_ledger.charge("videos.list")
+                response = await execute_async(request)
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching video metadata: {str(e)}")
+                raise Exception(f"Error fetching video metadata: {str(e)}")
+            for item in response.get('items', []):
+                metadata[item['id']] = item
+        return metadata
@@ -0,0 +1,317 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers cached responses up to slow multi-page filmot searches
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# Series of one metric: label values -> value (a number, or a list for histograms)
+Series = Dict[Tuple, Any]
+
+
+def merge_series(total: Dict[str, Series], collected: Dict[str, Series]):
+    """Add ``collected`` (see Registry.collect) into ``total``, series by series."""
+    for name, series in collected.items():
+        merged = total.setdefault(name, {})
+        for labelvalues, value in series.items():
+            current = merged.get(labelvalues)
+            if current is None:
+                merged[labelvalues] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[labelvalues] = [a + b for a, b in zip(current, value)]
+            else:
+                merged[labelvalues] = current + value
+
+
+class Counter:
+    """Monotonic counter, one series per tuple of label values."""
+
+    type = "counter"
+    per_process = True
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def collect(self) -> Series:
+        return dict(self._values)
+
+    def samples(self, collected: Optional[Dict[str, Series]] = None) -> Iterable[str]:
+        series = self.collect() if collected is None else collected.get(self.name, {})
+        for labelvalues, value in series.items():
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_format(value)}"
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class Histogram:
+    """Fixed-bucket histogram; an observation is one bisect and two adds."""
+
+    type = "histogram"
+    per_process = True
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, _HistogramSeries] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series.counts) if series else 0
+
+    def collect(self) -> Series:
+        """Bucket counts followed by the sum, per series."""
+        return {labelvalues: series.counts + [series.sum] for labelvalues, series in list(self._series.items())}
+
+    def samples(self, collected: Optional[Dict[str, Series]] = None) -> Iterable[str]:
+        bounds = self.buckets + (float("inf"),)
+        series = self.collect() if collected is None else collected.get(self.name, {})
+        for labelvalues, values in series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                labels = _labels(self.labelnames, labelvalues, f'le="{_format(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format(values[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric:
+    """Metric whose series are read from other objects at scrape time.
+
+    Each source returns a mapping of label-value tuples to values, so
+    components that already keep their own counters are not double counted.
+    Sources that already read host-wide state pass ``per_process=False`` so
+    their values are not summed across workers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: str,
+        labelnames: Sequence[str] = (),
+        per_process: bool = True
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.per_process = per_process
+        self._sources: List[Callable[[], Dict[Tuple, float]]] = []
+
+    def add_source(self, source: Callable[[], Dict[Tuple, float]]):
+        self._sources.append(source)
+
+    def collect(self) -> Series:
+        series = {}
+        for source in self._sources:
+            series.update(source())
+        return series
+
+    def samples(self, collected: Optional[Dict[str, Series]] = None) -> Iterable[str]:
+        use_local = collected is None or not self.per_process
+        series = self.collect() if use_local else collected.get(self.name, {})
+        for labelvalues, value in series.items():
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_format(value)}"
+
+
+class RatioGauge:
+    """Gauge derived at render time from a counter whose last label is an outcome.
+
+    Per combination of the other labels, it is the share of the counter's
+    total whose outcome is one of ``outcomes``. Computing it from the
+    (merged) counter keeps it right when workers are aggregated.
+    """
+
+    type = "gauge"
+    per_process = False
+
+    def __init__(self, name: str, documentation: str, counter, outcomes: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.counter = counter
+        self.labelnames = counter.labelnames[:-1]
+        self.outcomes = set(outcomes)
+
+    def samples(self, collected: Optional[Dict[str, Series]] = None) -> Iterable[str]:
+        series = self.counter.collect() if collected is None else collected.get(self.counter.name, {})
+        totals: Dict[Tuple, List[float]] = {}
+        for labelvalues, value in series.items():
+            total = totals.setdefault(labelvalues[:-1], [0, 0])
+            total[1] += value
+            if labelvalues[-1] in self.outcomes:
+                total[0] += value
+        for labelvalues, (matching, total) in totals.items():
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {_format(matching / total if total else 0.0)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collect(self) -> Dict[str, Series]:
+        """This process's series of every per-process metric, by metric name."""
+        return {metric.name: metric.collect() for metric in self._metrics if metric.per_process}
+
+    def render(self, collected: Optional[Dict[str, Series]] = None) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4).
+
+        ``collected`` replaces this process's per-process series, e.g. with
+        the merged series of every worker.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples(collected))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an API request, per route template and status.",
+    ("method", "route", "status")
+))
+UPSTREAM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to filmot.com and the YouTube Data API.",
+    ("upstream",)
+))
+UPSTREAM_ERRORS = REGISTRY.register(Counter(
+    "upstream_errors_total",
+    "Failed upstream calls, by upstream and reason.",
+    ("upstream", "reason")
+))
+PARSE_DURATION = REGISTRY.register(Histogram(
+    "filmot_parse_duration_seconds",
+    "Time to parse one filmot result page, including the trip to the parse worker.",
+    ("page_type",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+))
+ROWS_EXTRACTED = REGISTRY.register(Counter(
+    "filmot_rows_extracted_total",
+    "Videos extracted from filmot result pages.",
+    ("page_type",)
+))
+RATE_LIMIT_REJECTIONS = REGISTRY.register(Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected with 429 by the API rate limiter.",
+    ("route",)
+))
+PREFETCH_SEARCHES = REGISTRY.register(Counter(
+    "prefetch_searches_total",
+    "Background prefetch searches by outcome (refreshed, error, budget_exhausted, backoff).",
+    ("outcome",)
+))
+CACHE_LOOKUPS = REGISTRY.register(CallbackMetric(
+    "cache_lookups_total",
+    "Cache lookups by result (hit, stale or miss).",
+    "counter",
+    ("cache", "result")
+))
+CACHE_HIT_RATIO = REGISTRY.register(RatioGauge(
+    "cache_hit_ratio",
+    "Share of cache lookups served from cache, fresh or stale.",
+    CACHE_LOOKUPS,
+    ("hit", "stale")
+))
+
+# Read from the quota ledger, which is already shared by all workers
+QUOTA_SPENT = REGISTRY.register(CallbackMetric(
+    "youtube_quota_spent_units_total",
+    "YouTube Data API quota units spent today, by operation; resets at midnight Pacific.",
+    "counter",
+    ("operation",),
+    per_process=False
+))
+QUOTA_REMAINING = REGISTRY.register(CallbackMetric(
+    "youtube_quota_remaining_units",
+    "YouTube Data API quota units left today.",
+    "gauge",
+    per_process=False
+))
+QUOTA_REJECTIONS = REGISTRY.register(CallbackMetric(
+    "youtube_quota_rejections_total",
+    "YouTube Data API calls refused by the quota ledger today, by operation; resets at midnight Pacific.",
+    "counter",
+    ("operation",),
+    per_process=False
+))
+QUOTA_DEGRADED = REGISTRY.register(CallbackMetric(
+    "youtube_quota_degraded_responses_total",
+    "Searches answered in a degraded mode to save quota today, by mode; resets at midnight Pacific.",
+    "counter",
+    ("mode",),
+    per_process=False
+))
+
+
+def register_quota(ledger):
+    """Expose a QuotaLedger's spend, remaining budget, rejections and degraded responses."""
+    QUOTA_SPENT.add_source(lambda: {(operation,): units for operation, units in ledger.spend_by_operation().items()})
+    QUOTA_REMAINING.add_source(lambda: {(): ledger.remaining()})
+    QUOTA_REJECTIONS.add_source(lambda: {(operation,): count for operation, count in ledger.rejections().items()})
+    QUOTA_DEGRADED.add_source(lambda: {(mode,): count for mode, count in ledger.degraded().items()})
+
+
+def register_cache(name: str, cache):
+    """Expose a SearchResultCache's counters under ``cache="name"``."""
+    CACHE_LOOKUPS.add_source(lambda: {
+        (name, "hit"): cache.hits,
+        (name, "stale"): cache.stale_hits,
+        (name, "miss"): cache.misses
+    })
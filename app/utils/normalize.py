@@ -0,0 +1,45 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+# Suffixes filmot uses for abbreviated counts, e.g. "46.70M" subscribers
+COUNT_SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+# Upload dates are ISO on filmot; the others are accepted for robustness
+DATE_FORMATS = ("%Y-%m-%d", "%b %d, %Y", "%d %b %Y", "%Y/%m/%d")
+
+
+@lru_cache(maxsize=16384)
+def parse_count(text: str) -> Optional[int]:
+    """Parse a display count ("2,544,839", "496.2K", "1.2M") to an integer.
+
+    Returns None for text that is not a count, such as "Unknown".
+    """
+    text = text.replace(",", "").replace(" ", "").strip().lower()
+    if not text:
+        return None
+    multiplier = COUNT_SUFFIXES.get(text[-1])
+    if multiplier:
+        text = text[:-1]
+    try:
+        if multiplier:
+            return round(float(text) * multiplier)
+        return int(text)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=16384)
+def parse_date(text: str) -> Optional[str]:
+    """Normalize a displayed date to ISO ``YYYY-MM-DD``, or None if unparseable.
+
+    Kept as a string so records stay JSON- and pickle-friendly; the API
+    models parse it into a ``date``.
+    """
+    text = text.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            continue
+    return None
@@ -0,0 +1,92 @@
+from contextvars import ContextVar
+from fastapi.routing import APIRoute
+from typing import Dict, Optional
+import asyncio
+import functools
+import time
+from app.config.settings import settings
+
+# Stage durations of the request being profiled; None (the default) means off
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+# Set when the endpoint returns; FastAPI serializes the response after that
+ENDPOINT_END = "_endpoint_end"
+
+
+def profiling_enabled() -> bool:
+    """Whether any request can be profiled with the current settings."""
+    return bool(settings.profiling_token) or settings.profiling_sample_rate > 0
+
+
+def start_timings() -> Dict[str, float]:
+    """Start collecting stage timings for the current request context."""
+    timings: Dict[str, float] = {}
+    _timings.set(timings)
+    return timings
+
+
+def stop_timings():
+    _timings.set(None)
+
+
+def record(name: str, seconds: float):
+    """Add ``seconds`` to stage ``name`` if the current request is profiled.
+
+    Concurrent work (e.g. several page fetches) adds up, so a stage can
+    exceed the request's wall time.
+    """
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+class stage:
+    """Time a block as stage ``name``; a no-op unless the request is profiled."""
+
+    __slots__ = ("name", "timings", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = _timings.get()
+        if self.timings is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.timings is not None:
+            self.timings[self.name] = self.timings.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Format stage timings as a Server-Timing header value (milliseconds)."""
+    return ", ".join(
+        f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items() if not name.startswith("_")
+    )
+
+
+def _mark_endpoint_end(endpoint):
+    if not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings = _timings.get()
+            if timings is not None:
+                timings[ENDPOINT_END] = time.perf_counter()
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that notes when its endpoint returns, so the time FastAPI
+    then spends validating and rendering the response can be reported as
+    the ``serialize`` stage."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_endpoint_end(endpoint), **kwargs)
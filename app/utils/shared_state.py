@@ -0,0 +1,306 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+import asyncio
+import sqlite3
+import threading
+import time
+from app.config.settings import settings
+
+# Expired rows are swept after this many writes on a connection
+PURGE_EVERY = 1000
+
+T = TypeVar("T")
+
+
+class SharedStateError(Exception):
+    """Raised when the shared-state backend cannot be read or written."""
+
+
+class MemoryState:
+    """Process-local backend: fast, but every worker keeps its own state."""
+
+    cross_process = False
+
+    def __init__(self, timer=time.time):
+        self._timer = timer
+        self._counters: Dict[str, list] = {}
+        self._values: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _purge(self, now: float):
+        for store in (self._counters, self._values):
+            for key in [key for key, item in store.items() if item[1] is not None and item[1] <= now]:
+                del store[key]
+
+    def _tick(self, now: float):
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self._purge(now)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Add ``amount`` to a counter and return the new value.
+
+        A counter's TTL is fixed when it is created; once it expires the
+        counter restarts from zero.
+        """
+        now = self._timer()
+        with self._lock:
+            self._tick(now)
+            counter = self._counters.get(key)
+            if counter is None or (counter[1] is not None and counter[1] <= now):
+                counter = self._counters[key] = [0, now + ttl if ttl else None]
+            counter[0] += amount
+            return counter[0]
+
+    def incr_within(self, key: str, amount: int, limit: int, ttl: Optional[float] = None) -> Optional[int]:
+        """Add ``amount`` to a counter unless that takes it past ``limit``.
+
+        Returns the new value, or None when the counter was left unchanged.
+        The check and the update are one step, like ``incr``.
+        """
+        now = self._timer()
+        with self._lock:
+            self._tick(now)
+            counter = self._counters.get(key)
+            expired = counter is None or (counter[1] is not None and counter[1] <= now)
+            if (0 if expired else counter[0]) + amount > limit:
+                return None
+            if expired:
+                counter = self._counters[key] = [0, now + ttl if ttl else None]
+            counter[0] += amount
+            return counter[0]
+
+    def counter(self, key: str) -> int:
+        now = self._timer()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or (counter[1] is not None and counter[1] <= now):
+                return 0
+            return counter[0]
+
+    def counters(self, prefix: str) -> Dict[str, int]:
+        """Live counters whose key starts with ``prefix``, keyed by the rest of the key."""
+        now = self._timer()
+        with self._lock:
+            return {
+                key[len(prefix):]: value
+                for key, (value, expires) in self._counters.items()
+                if key.startswith(prefix) and (expires is None or expires > now)
+            }
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = self._timer()
+        with self._lock:
+            item = self._values.get(key)
+            if item is None or (item[1] is not None and item[1] <= now):
+                return None
+            return item[0]
+
+    def values(self, prefix: str) -> Dict[str, bytes]:
+        """Live values whose key starts with ``prefix``, keyed by the rest of the key."""
+        now = self._timer()
+        with self._lock:
+            return {
+                key[len(prefix):]: value
+                for key, (value, expires) in self._values.items()
+                if key.startswith(prefix) and (expires is None or expires > now)
+            }
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        now = self._timer()
+        with self._lock:
+            self._tick(now)
+            self._values[key] = (value, now + ttl if ttl else None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._values.clear()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Call ``fn``, which uses this backend, from async code.
+
+        Memory calls never wait, so ``fn`` runs inline.
+        """
+        return fn(*args)
+
+    def shutdown(self):
+        pass
+
+
+class SQLiteState:
+    """Backend shared by every process on the host through one SQLite file.
+
+    The database runs in WAL mode so readers never block the single writer,
+    and each update is a single upsert statement, which SQLite applies
+    atomically across processes. Connections are per thread.
+    """
+
+    cross_process = True
+
+    def __init__(self, path: Optional[str] = None, timer=time.time):
+        self.path = path or settings.shared_state_path
+        self._timer = timer
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+            self._local.conn = conn
+            self._local.writes = 0
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        try:
+            return self._connection().execute(sql, params)
+        except sqlite3.Error as e:
+            raise SharedStateError(str(e)) from e
+
+    def _tick(self, now: float):
+        self._local.writes += 1
+        if self._local.writes % PURGE_EVERY == 0:
+            self._execute("DELETE FROM counters WHERE expires <= ?", (now,))
+            self._execute("DELETE FROM kv WHERE expires <= ?", (now,))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Add ``amount`` to a counter and return the new value.
+
+        A counter's TTL is fixed when it is created; once it expires the
+        counter restarts from zero.
+        """
+        now = self._timer()
+        row = self._execute(
+            "INSERT INTO counters (key, value, expires) VALUES (?1, ?2, ?3) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires <= ?4 THEN excluded.value ELSE value + excluded.value END, "
+            "expires = CASE WHEN expires <= ?4 THEN excluded.expires ELSE expires END "
+            "RETURNING value",
+            (key, amount, now + ttl if ttl else None, now)
+        ).fetchone()
+        self._tick(now)
+        return row[0]
+
+    def incr_within(self, key: str, amount: int, limit: int, ttl: Optional[float] = None) -> Optional[int]:
+        """Add ``amount`` to a counter unless that takes it past ``limit``.
+
+        Returns the new value, or None when the counter was left unchanged.
+        The check is part of the upsert, so it holds across processes.
+        """
+        now = self._timer()
+        row = self._execute(
+            "INSERT INTO counters (key, value, expires) SELECT ?1, ?2, ?3 WHERE ?2 <= ?5 "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires <= ?4 THEN excluded.value ELSE value + excluded.value END, "
+            "expires = CASE WHEN expires <= ?4 THEN excluded.expires ELSE expires END "
+            "WHERE CASE WHEN expires <= ?4 THEN 0 ELSE value END + excluded.value <= ?5 "
+            "RETURNING value",
+            (key, amount, now + ttl if ttl else None, now, limit)
+        ).fetchone()
+        self._tick(now)
+        return row[0] if row else None
+
+    def counter(self, key: str) -> int:
+        row = self._execute(
+            "SELECT value FROM counters WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, self._timer())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def counters(self, prefix: str) -> Dict[str, int]:
+        """Live counters whose key starts with ``prefix``, keyed by the rest of the key."""
+        rows = self._execute(
+            "SELECT key, value FROM counters "
+            "WHERE key >= ? AND key < ? AND (expires IS NULL OR expires > ?)",
+            (prefix, prefix + "\uffff", self._timer())
+        ).fetchall()
+        return {key[len(prefix):]: value for key, value in rows}
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._execute(
+            "SELECT value FROM kv WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, self._timer())
+        ).fetchone()
+        return row[0] if row else None
+
+    def values(self, prefix: str) -> Dict[str, bytes]:
+        """Live values whose key starts with ``prefix``, keyed by the rest of the key."""
+        rows = self._execute(
+            "SELECT key, value FROM kv "
+            "WHERE key >= ? AND key < ? AND (expires IS NULL OR expires > ?)",
+            (prefix, prefix + "\uffff", self._timer())
+        ).fetchall()
+        return {key[len(prefix):]: value for key, value in rows}
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        now = self._timer()
+        self._execute(
+            "INSERT INTO kv (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+            (key, value, now + ttl if ttl else None)
+        )
+        self._tick(now)
+
+    def delete(self, key: str):
+        self._execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def clear(self):
+        self._execute("DELETE FROM counters")
+        self._execute("DELETE FROM kv")
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Call ``fn``, which uses this backend, from async code.
+
+        ``fn`` runs in this backend's own thread pool: while another process
+        holds the write lock a statement waits up to the connection's 5 s busy
+        timeout, which must not stall the event loop, nor the default executor
+        that index writes and result filtering share.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.shared_state_threads),
+                    thread_name_prefix="shared-state"
+                )
+            return self._executor
+
+    def shutdown(self):
+        """Stop the thread pool; a new one is started on next use."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def create_shared_state(backend: Optional[str] = None, path: Optional[str] = None):
+    """Build the configured backend: "sqlite" (shared by all workers) or "memory"."""
+    backend = backend or settings.shared_state_backend
+    if backend == "sqlite":
+        return SQLiteState(path)
+    if backend == "memory":
+        return MemoryState()
+    raise ValueError(f"Unknown shared state backend: {backend}")
+
+
+shared_state = create_shared_state()
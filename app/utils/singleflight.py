@@ -0,0 +1,93 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional
+import asyncio
+
+Publish = Callable[[Any], None]
+
+
+class Flight:
+    """One in-flight call, and the partial results it has published so far.
+
+    Published items are kept until the call completes, so a follower that
+    joins late first gets the items already published and then waits for
+    the rest.
+    """
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.published: List[Any] = []
+        self._arrived = asyncio.Event()
+
+    def publish(self, item: Any):
+        self.published.append(item)
+        self._wake()
+
+    def _wake(self):
+        arrived, self._arrived = self._arrived, asyncio.Event()
+        arrived.set()
+
+    async def result(self) -> Any:
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(self.task)
+
+    async def follow(self) -> AsyncIterator[Any]:
+        """Yield every published item in order until the call completes.
+
+        Raises the call's exception, if any, after the last item. A follower
+        that stops early or is cancelled leaves the call running for the others.
+        """
+        position = 0
+        while True:
+            if position < len(self.published):
+                position += 1
+                yield self.published[position - 1]
+            elif self.task.done():
+                break
+            else:
+                await self._arrived.wait()
+        self.task.result()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key.
+
+    The first caller for a key starts ``fn``; callers arriving while it is
+    in flight await the same task and receive the same result or exception.
+    The key is forgotten as soon as the call completes, so results are never
+    served after the fact.
+
+    ``join`` is the multi-consumer form: ``fn`` is handed a ``publish``
+    callable for partial results, which every caller can ``follow`` as they
+    arrive, as well as await the final result.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await self.join(key, lambda publish: fn()).result()
+
+    def join(self, key: Hashable, fn: Callable[[Publish], Awaitable[Any]]) -> Flight:
+        """The in-flight call for ``key``, started as ``fn(publish)`` if there is none."""
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            flight = self._flights[key] = Flight()
+            flight.task = asyncio.ensure_future(fn(flight.publish))
+            flight.task.add_done_callback(lambda task: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+        return flight
+
+    def _forget(self, key: Hashable, flight: Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Followers waiting for the next item see the call is done
+        flight._wake()
+        if not flight.task.cancelled():
+            # Mark the exception retrieved in case every waiter went away
+            flight.task.exception()
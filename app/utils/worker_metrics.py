@@ -0,0 +1,129 @@
+from typing import Dict, Optional
+import asyncio
+import json
+import logging
+import os
+from app.config.settings import settings
+from app.utils.metrics import REGISTRY, Series, merge_series
+from app.utils.shared_state import SharedStateError, shared_state
+
+logger = logging.getLogger(__name__)
+
+LIVE_PREFIX = "metrics:worker:"
+RETIRED_PREFIX = "metrics:retired:"
+
+
+def _encode(collected: Dict[str, Series]) -> bytes:
+    return json.dumps({
+        name: [[list(labelvalues), value] for labelvalues, value in series.items()]
+        for name, series in collected.items()
+    }).encode()
+
+
+def _decode(raw: bytes) -> Dict[str, Series]:
+    return {
+        name: {tuple(labelvalues): value for labelvalues, value in series}
+        for name, series in json.loads(raw).items()
+    }
+
+
+class WorkerMetrics:
+    """Host-wide totals of every worker's per-process metrics, for /metrics.
+
+    Each worker publishes its series to the shared state every ``interval``
+    seconds under its pid, with a TTL of a few intervals, and a scrape adds
+    up the live snapshots with the scraping worker's current series. A
+    worker that shuts down folds its final series into non-expiring shared
+    counters, so host totals stay monotonic across worker restarts; a worker
+    that is killed drops out once its snapshot expires, which Prometheus
+    treats as a counter reset. Every per-process metric is a counter or a
+    histogram, so adding series up is always right.
+
+    With a per-process backend there is nothing to aggregate and scrapes
+    render this worker's metrics as they are.
+    """
+
+    def __init__(self, state, registry=REGISTRY, interval: Optional[float] = None):
+        self.state = state
+        self.registry = registry
+        self.interval = interval or settings.metrics_publish_interval_seconds
+        self.worker = str(os.getpid())
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.state.cross_process and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.state.run(self._retire, self.registry.collect())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # Collected on the loop, where the metrics are updated; written in state.run
+            await self.state.run(self._publish, self.registry.collect())
+
+    async def render(self) -> str:
+        """The Prometheus text for a scrape, summed over every worker on the host."""
+        if not self.state.cross_process:
+            return self.registry.render()
+        return await self.state.run(self._render_host, self.registry.collect())
+
+    def _publish(self, collected: Dict[str, Series]):
+        try:
+            self.state.set(LIVE_PREFIX + self.worker, _encode(collected), ttl=3 * self.interval)
+        except SharedStateError as e:
+            logger.error(f"Failed to publish worker metrics: {str(e)}")
+
+    def _retire(self, collected: Dict[str, Series]):
+        try:
+            for name, series in collected.items():
+                for labelvalues, value in series.items():
+                    # Histogram lists are kept whole, zeros included, so they keep their length
+                    values = value if isinstance(value, list) else [value]
+                    for index, amount in enumerate(values):
+                        position = index if isinstance(value, list) else -1
+                        self.state.incr(RETIRED_PREFIX + json.dumps([name, list(labelvalues), position]), amount)
+            self.state.delete(LIVE_PREFIX + self.worker)
+        except SharedStateError as e:
+            logger.error(f"Failed to retire worker metrics: {str(e)}")
+
+    def _retired(self) -> Dict[str, Series]:
+        collected: Dict[str, Series] = {}
+        for key, amount in self.state.counters(RETIRED_PREFIX).items():
+            name, labelvalues, position = json.loads(key)
+            series = collected.setdefault(name, {})
+            labelvalues = tuple(labelvalues)
+            if position < 0:
+                series[labelvalues] = amount
+            else:
+                values = series.setdefault(labelvalues, [])
+                values.extend([0] * (position + 1 - len(values)))
+                values[position] = amount
+        return collected
+
+    def _render_host(self, collected: Dict[str, Series]) -> str:
+        # Publishing first lets the next scrape, on any worker, see these counts too
+        self._publish(collected)
+        total: Dict[str, Series] = {}
+        merge_series(total, collected)
+        try:
+            for worker, raw in self.state.values(LIVE_PREFIX).items():
+                if worker != self.worker:
+                    merge_series(total, _decode(raw))
+            merge_series(total, self._retired())
+        except (SharedStateError, ValueError) as e:
+            logger.error(f"Failed to read other workers' metrics: {str(e)}")
+            total = collected
+        return self.registry.render(total)
+
+
+worker_metrics = WorkerMetrics(shared_state)
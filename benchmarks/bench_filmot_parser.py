@@ -0,0 +1,110 @@
+"""Benchmark filmot result-page extraction on the fixture pages.
+
+Compares the original full-document html.parser extraction with
+app.services.filmot_parser and checks both produce identical dicts. The
+bundled pages are synthetic (see benchmarks/fixtures/README.md); drop
+captured filmot pages into benchmarks/fixtures/filmot/ to check real markup.
+
+Usage:
+    python -m benchmarks.bench_filmot_parser [--repeat 20] [--parser lxml]
+"""
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from bs4 import BeautifulSoup  # noqa: E402
+from app.config.settings import settings  # noqa: E402
+from app.services.filmot_parser import extract_video_data, parse_result_rows, parse_duration_to_seconds  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures" / "filmot"
+
+
+def legacy_extract_page(html):
+    """Extraction as originally done in UnlistedVideoFinder."""
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find('table', class_="table border border-primary table-striped resp-tbl")
+    if not table or not table.find('tbody'):
+        return []
+    results = []
+    for row in table.find('tbody').find_all('tr'):
+        title_td = row.find('td', {'dth': 'Title'})
+        channel_td = row.find('td', {'dth': 'Channel'})
+        if not title_td or not channel_td:
+            continue
+        video_link = title_td.find('a')
+        if not video_link or 'href' not in video_link.attrs:
+            continue
+        duration_td = row.find('td', {'dth': 'Duration'})
+        duration = duration_td.text.strip() if duration_td else "0:00"
+        results.append({
+            'title': title_td.find('a').text.strip(),
+            'video_id': video_link['href'].split('=')[-1],
+            'url': video_link['href'],
+            'thumbnail': title_td.find('img', class_='lozad')['data-src'] if title_td.find('img', class_='lozad') else "",
+            'channel_name': channel_td.find('a').text.strip(),
+            'channel_id': channel_td.find('a')['href'].split('/')[-1],
+            'subscribers': channel_td.find('small').text.strip() if channel_td.find('small') else "Unknown",
+            'category': row.find('td', {'dth': 'Category'}).find('a').text.strip() if row.find('td', {'dth': 'Category'}) else "Unknown",
+            'duration': duration,
+            'duration_seconds': parse_duration_to_seconds.__wrapped__(duration),
+            'views': row.find('td', {'dth': 'Views'}).text.strip() if row.find('td', {'dth': 'Views'}) else "0",
+            'likes': row.find('td', {'dth': 'Likes'}).text.strip() if row.find('td', {'dth': 'Likes'}) else "0",
+            'dislikes': row.find('td', {'dth': 'Dislikes'}).text.strip() if row.find('td', {'dth': 'Dislikes'}) else "0",
+            'upload_date': row.find('td', {'dth': 'Uploaded'}).text.strip() if row.find('td', {'dth': 'Uploaded'}) else "Unknown",
+            'languages': {
+                'auto_generated': [img['title'] for img in row.find('td', {'dth': 'Auto-Generated'}).find_all('img')] if row.find('td', {'dth': 'Auto-Generated'}) else [],
+                'subtitles': [img['title'] for img in row.find('td', {'dth': 'Subtitles'}).find_all('img')] if row.find('td', {'dth': 'Subtitles'}) else []
+            }
+        })
+    return results
+
+
+def extract_page(html):
+    rows = parse_result_rows(html) or []
+    return [video for video in (extract_video_data(row) for row in rows) if video]
+
+
+def same_fields(legacy, current):
+    """Current records carry extra parsed fields; the legacy ones must match exactly."""
+    return len(legacy) == len(current) and all(
+        {key: video[key] for key in old} == old for old, video in zip(legacy, current)
+    )
+
+
+def measure(func, pages, repeat):
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            rows += len(func(html))
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--parser", default=settings.filmot_html_parser, help="html.parser or lxml")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    settings.filmot_html_parser = args.parser
+    pages = [path.read_text(encoding="utf-8") for path in sorted(FIXTURES.glob("*.html"))]
+
+    for html in pages:
+        if not same_fields(legacy_extract_page(html), extract_page(html)):
+            raise SystemExit("Extraction mismatch between legacy and current parser")
+
+    legacy = measure(legacy_extract_page, pages, args.repeat)
+    current = measure(extract_page, pages, args.repeat)
+    print(f"pages: {len(pages)}  repeat: {args.repeat}  parser: {args.parser}")
+    print(f"legacy   {legacy:10.0f} rows/sec")
+    print(f"current  {current:10.0f} rows/sec  ({current / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
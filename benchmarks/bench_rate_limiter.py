@@ -0,0 +1,94 @@
+"""Benchmark per-check cost of the rate limiter with many active clients.
+
+Compares the original list-of-datetimes limiter with the token-bucket
+RateLimiter in app.middleware.auth, reporting time per check and memory.
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [--clients 100000] [--checks 500000]
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.middleware.auth import RateLimiter  # noqa: E402
+
+
+class LegacyRateLimiter:
+    """The original implementation, kept for comparison."""
+
+    def __init__(self, limit):
+        self.requests = {}
+        self.limit = limit
+
+    def is_rate_limited(self, client_id):
+        minute_ago = datetime.now() - timedelta(minutes=1)
+        if client_id not in self.requests:
+            return False
+        recent_requests = [t for t in self.requests[client_id] if t > minute_ago]
+        self.requests[client_id] = recent_requests
+        return len(recent_requests) >= self.limit
+
+    def add_request(self, client_id):
+        if client_id not in self.requests:
+            self.requests[client_id] = []
+        self.requests[client_id].append(datetime.now())
+
+
+def legacy_check(limiter, client_id):
+    if limiter.is_rate_limited(client_id):
+        return False
+    limiter.add_request(client_id)
+    return True
+
+
+def current_check(limiter, client_id):
+    return limiter.hit([(client_id, limiter.limit)])
+
+
+def run(name, make_limiter, check, client_ids, checks):
+    # Memory: every client active once
+    tracemalloc.start()
+    limiter = make_limiter()
+    for client_id in client_ids:
+        check(limiter, client_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Time: random checks across all clients, then one hot client at its limit
+    sample = random.Random(0).choices(client_ids, k=checks)
+    start = time.perf_counter()
+    for client_id in sample:
+        check(limiter, client_id)
+    spread = (time.perf_counter() - start) / checks
+
+    hot = client_ids[0]
+    start = time.perf_counter()
+    for _ in range(checks):
+        check(limiter, hot)
+    hot_cost = (time.perf_counter() - start) / checks
+
+    print(f"{name:8} {spread * 1e6:6.2f} us/check (spread)  {hot_cost * 1e6:6.2f} us/check (hot client)"
+          f"  memory {peak / 2**20:6.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100000)
+    parser.add_argument("--checks", type=int, default=500000)
+    parser.add_argument("--limit", type=int, default=60)
+    args = parser.parse_args()
+
+    client_ids = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    print(f"clients: {args.clients}  checks: {args.checks}  limit: {args.limit}/min")
+    run("legacy", lambda: LegacyRateLimiter(args.limit), legacy_check, client_ids, args.checks)
+    run("current", lambda: RateLimiter(limit=args.limit, max_keys=args.clients * 2), current_check, client_ids, args.checks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark server-side filtering and sorting of cached unlisted results.
+
+Times app.services.result_filter over 10k and 50k-row result sets for a
+set of typical filter/sort combinations, once the columns are built, and
+checks every result against a plain list comprehension over the dicts.
+
+Usage:
+    python -m benchmarks.bench_result_filter [--sizes 10000 50000]
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date
+from typing import Dict, List
+
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.services.filmot_parser import extract_page_videos  # noqa: E402
+from app.services.result_filter import SORT_COLUMNS, ResultColumns, filter_and_sort  # noqa: E402
+from benchmarks.recorded import load_filmot_pages  # noqa: E402
+
+CASES = {
+    "min_views": ({"min_views": 100_000}, None, True),
+    "max_duration": ({"max_duration": 60}, None, True),
+    "subtitles en|es": ({"subtitle_languages": ["en", "es"]}, None, True),
+    "combined": ({"min_views": 10_000, "max_duration": 120, "uploaded_after": date(2018, 1, 1)}, None, True),
+    "sort subscribers": ({}, "subscribers", True),
+    "sort uploaded asc": ({}, "uploaded", False),
+    "combined + sort": ({"min_views": 10_000, "min_subscribers": 1_000}, "likes", True)
+}
+
+
+def make_rows(size: int) -> List[Dict]:
+    rng = random.Random(size)
+    base = [video for html in load_filmot_pages()["search"] for video in extract_page_videos(html)]
+    rows = []
+    for i in range(size):
+        video = dict(base[i % len(base)])
+        # Spread the values so filters cut at different places
+        video["video_id"] = f"{video['video_id']}{i}"
+        video["views_count"] = rng.choice([None, rng.randint(0, 5_000_000)])
+        video["subscribers_count"] = rng.randint(0, 10_000_000)
+        video["likes_count"] = rng.randint(0, 100_000)
+        video["duration_seconds"] = rng.randint(5, 900)
+        video["uploaded_on"] = date(rng.randint(2010, 2025), rng.randint(1, 12), rng.randint(1, 28)).isoformat()
+        rows.append(video)
+    return rows
+
+
+def reference(videos, filters, sort_by, descending):
+    def keep(video):
+        views, subscribers = video.get("views_count"), video.get("subscribers_count")
+        return (
+            ("min_views" not in filters or (views is not None and views >= filters["min_views"]))
+            and ("max_duration" not in filters or video["duration_seconds"] <= filters["max_duration"])
+            and ("min_subscribers" not in filters or (subscribers is not None and subscribers >= filters["min_subscribers"]))
+            and ("uploaded_after" not in filters or (
+                video.get("uploaded_on") is not None and date.fromisoformat(video["uploaded_on"]) > filters["uploaded_after"]))
+            and ("subtitle_languages" not in filters or any(
+                language in video["languages"]["subtitles"] for language in filters["subtitle_languages"]))
+        )
+
+    matches = [video for video in videos if keep(video)]
+    if sort_by:
+        field = SORT_COLUMNS[sort_by]
+
+        def key(video):
+            value = video.get(field)
+            value = -1 if value is None else date.fromisoformat(value).toordinal() if field == "uploaded_on" else value
+            return -value if descending else value
+        matches.sort(key=key)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        videos = make_rows(size)
+        start = time.perf_counter()
+        ResultColumns(videos)
+        print(f"\n{size} rows, columns built in {(time.perf_counter() - start) * 1000:.1f} ms (once per cached result)")
+        print(f"{'case':20} {'matches':>8} {'filter+sort ms':>15} {'list comp ms':>13}")
+        for name, (filters, sort_by, descending) in CASES.items():
+            result = filter_and_sort(videos, sort_by=sort_by, descending=descending, **filters)
+            start = time.perf_counter()
+            expected = reference(videos, filters, sort_by, descending)
+            naive = time.perf_counter() - start
+            if [video["video_id"] for video in result] != [video["video_id"] for video in expected]:
+                raise SystemExit(f"{name}: result differs from the reference for {size} rows")
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                filter_and_sort(videos, sort_by=sort_by, descending=descending, **filters)
+                best = min(best, time.perf_counter() - start)
+            print(f"{name:20} {len(result):8} {best * 1000:15.3f} {naive * 1000:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
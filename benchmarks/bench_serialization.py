@@ -0,0 +1,80 @@
+"""Benchmark /api/search-unlisted response serialization per item.
+
+Compares the previous path (UnlistedVideo(**video) per row, then FastAPI
+response_model validation, jsonable_encoder and JSONResponse rendering)
+with the TypeAdapter fast path in app.api.serialization, for 1k, 10k and
+100k-row responses, and checks both produce the same JSON.
+
+Usage:
+    python -m benchmarks.bench_serialization [--sizes 1000 10000 100000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Union
+
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.api.serialization import unlisted_list_response  # noqa: E402
+from app.models.unlisted_ad import UnlistedVideo  # noqa: E402
+from app.services.filmot_parser import extract_page_videos  # noqa: E402
+from benchmarks.recorded import load_filmot_pages  # noqa: E402
+
+LEGACY_FIELD = create_response_field(
+    name="legacy", type_=Dict[str, Union[int, Optional[str], List[UnlistedVideo]]]
+)
+
+
+def make_rows(size: int) -> List[Dict]:
+    base = [video for html in load_filmot_pages()["search"] for video in extract_page_videos(html)]
+    return [{**base[i % len(base)], "video_id": f"{base[i % len(base)]['video_id']}{i}"} for i in range(size)]
+
+
+async def legacy_response(videos: List[Dict]) -> bytes:
+    video_models = [UnlistedVideo(**video) for video in videos]
+    content = await serialize_response(field=LEGACY_FIELD, response_content={"count": len(video_models), "videos": video_models})
+    return JSONResponse(content).body
+
+
+async def fast_response(videos: List[Dict]) -> bytes:
+    return unlisted_list_response(videos).body
+
+
+def measure(func, videos, repeat) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(func(videos))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(f"{'rows':>8} {'legacy us/item':>15} {'fast us/item':>13} {'speedup':>8} {'body MiB':>9}")
+    for size in args.sizes:
+        videos = make_rows(size)
+        legacy_body = asyncio.run(legacy_response(videos))
+        fast_body = asyncio.run(fast_response(videos))
+        if json.loads(legacy_body) != json.loads(fast_body):
+            raise SystemExit(f"Serialized output differs for {size} rows")
+        legacy = measure(legacy_response, videos, args.repeat)
+        fast = measure(fast_response, videos, args.repeat)
+        print(f"{size:8} {legacy / size * 1e6:15.2f} {fast / size * 1e6:13.2f} {legacy / fast:7.1f}x {len(fast_body) / 2**20:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
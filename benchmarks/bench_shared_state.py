@@ -0,0 +1,114 @@
+"""Benchmark the shared-state backend under multi-process contention.
+
+Starts one process per simulated gunicorn worker; they all hammer the same
+SQLite file with atomic counter increments (one hot key, as with a single
+busy client, and spread keys), rate-limit checks and cache reads/writes.
+Reports aggregate ops/sec and checks that no increment was lost.
+
+Usage:
+    python -m benchmarks.bench_shared_state [--workers 4] [--ops 5000]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from app.middleware.auth import SharedRateLimiter  # noqa: E402
+from app.utils.shared_state import MemoryState, SQLiteState  # noqa: E402
+
+PAYLOAD = b"x" * 2048  # roughly one cached page of results
+
+
+def hot_incr(state, worker, i):
+    state.incr("bench:hot", 1, ttl=600)
+
+
+def spread_incr(state, worker, i):
+    state.incr(f"bench:spread:{i % 1000}", 1, ttl=600)
+
+
+def rate_limit(state, worker, i):
+    SharedRateLimiter(state, limit=10 ** 9).hit([(("client", f"10.0.{worker}.{i % 250}"), 10 ** 9)])
+
+
+def cache_mixed(state, worker, i):
+    # 90% reads, 10% writes over 500 keys
+    key = f"bench:cache:{i % 500}"
+    if i % 10 == 0:
+        state.set(key, PAYLOAD, ttl=600)
+    else:
+        state.get(key)
+
+
+SCENARIOS = {
+    "hot incr": hot_incr,
+    "spread incr": spread_incr,
+    "rate-limit hit": rate_limit,
+    "cache 90/10": cache_mixed
+}
+
+
+def worker_main(path, scenario, worker, ops, start_event, results):
+    state = SQLiteState(path)
+    op = SCENARIOS[scenario]
+    op(state, worker, 0)  # open the connection outside the timed loop
+    start_event.wait()
+    started = time.perf_counter()
+    for i in range(1, ops + 1):
+        op(state, worker, i)
+    results.put(time.perf_counter() - started)
+
+
+def run_sqlite(path, scenario, workers, ops):
+    SQLiteState(path).clear()
+    start_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=worker_main, args=(path, scenario, worker, ops, start_event, results))
+        for worker in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    time.sleep(0.5)
+    start_event.set()
+    elapsed = max(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    return workers * ops / elapsed
+
+
+def run_memory(scenario, ops):
+    state = MemoryState()
+    op = SCENARIOS[scenario]
+    started = time.perf_counter()
+    for i in range(ops):
+        op(state, 0, i)
+    return ops / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=5000, help="operations per worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared_state.sqlite3")
+        print(f"workers: {args.workers}  ops/worker: {args.ops}")
+        for scenario in SCENARIOS:
+            shared = run_sqlite(path, scenario, args.workers, args.ops)
+            local = run_memory(scenario, args.ops)
+            print(f"{scenario:15} sqlite {shared:10.0f} ops/sec   memory (1 proc) {local:10.0f} ops/sec")
+            if scenario == "hot incr":
+                total = SQLiteState(path).counter("bench:hot")
+                expected = args.workers * (args.ops + 1)
+                if total != expected:
+                    raise SystemExit(f"Lost updates: counter is {total}, expected {expected}")
+
+
+if __name__ == "__main__":
+    main()
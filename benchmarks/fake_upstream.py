@@ -0,0 +1,230 @@
+"""Local stand-in for filmot.com and the YouTube Data API, for load tests.
+
+Serves generated unlistedSearch result tables and search/videos JSON, with
+configurable latency, error rate and filmot 403 rate. Responses are
+deterministic per query and page, so repeated searches return the same data.
+
+Usage:
+    python -m benchmarks.fake_upstream --port 9100 --latency-ms 150 --jitter-ms 100 \\
+        --error-rate 0.01 --forbidden-rate 0.05
+
+Then start the API against it:
+    FILMOT_BASE_URL=http://127.0.0.1:9100/unlistedSearch \\
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:9100/ uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import html
+import json
+import random
+import string
+import zlib
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse
+
+CATEGORIES = ["Entertainment", "Education", "Music", "Comedy", "Gaming", "Howto & Style", "People & Blogs"]
+LANGUAGES = ["en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko"]
+BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Soylent", "Hooli", "Wayne", "Tyrell", "Stark", "Wonka"]
+KINDS = ["Commercial", "Ad Spot", "Promo", "Teaser", "How To Use", "Unboxing"]
+ID_CHARS = string.ascii_letters + string.digits + "-_"
+
+
+@dataclass
+class UpstreamConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    forbidden_rate: float = 0.0
+    rows_per_page: int = 50
+    max_pages: int = 10
+
+
+config = UpstreamConfig()
+app = FastAPI(title="Fake filmot / YouTube Data API upstream")
+
+
+def _rng(*parts) -> random.Random:
+    return random.Random(zlib.crc32("|".join(str(part) for part in parts).encode()))
+
+
+def _video_id(rng: random.Random) -> str:
+    return "".join(rng.choice(ID_CHARS) for _ in range(11))
+
+
+def _channel_id(rng: random.Random) -> str:
+    return "UC" + "".join(rng.choice(ID_CHARS) for _ in range(22))
+
+
+def _compact(number: int) -> str:
+    if number >= 1_000_000:
+        return f"{number / 1_000_000:.2f}M"
+    if number >= 1_000:
+        return f"{number / 1_000:.1f}K"
+    return str(number)
+
+
+def _flags(rng: random.Random) -> str:
+    return " ".join(
+        f'<img src="/flags/{lang}.png" title="{lang}" width="16">'
+        for lang in rng.sample(LANGUAGES, rng.randint(0, 3))
+    )
+
+
+def _duration(rng: random.Random) -> str:
+    seconds = rng.choice([rng.randint(6, 120), rng.randint(121, 1200)])
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+
+
+def _row(rng: random.Random, position: int, channel_id: str = None) -> str:
+    brand = rng.choice(BRANDS)
+    video_id = _video_id(rng)
+    title = html.escape(f"{brand} {rng.choice(KINDS)} #{position}")
+    channel_id = channel_id or _channel_id(rng)
+    views = rng.randint(1_000, 5_000_000)
+    return (
+        f'<tr>\n<td dth="#" class="text-muted">{position}</td>\n'
+        f'<td dth="Title"><a href="https://www.youtube.com/watch?v={video_id}" target="_blank" rel="noopener">{title}</a>'
+        f'<br><img class="lozad" data-src="https://i.ytimg.com/vi/{video_id}/mqdefault.jpg" width="160" alt=""></td>\n'
+        f'<td dth="Channel"><a href="https://filmot.com/channel/{channel_id}">{brand} Channel</a>'
+        f'<br><small>{_compact(rng.randint(100, 50_000_000))}</small></td>\n'
+        f'<td dth="Category"><a href="https://filmot.com/unlistedSearch?category=1">{html.escape(rng.choice(CATEGORIES))}</a></td>\n'
+        f'<td dth="Duration">{_duration(rng)}</td>\n'
+        f'<td dth="Views">{views:,}</td>\n'
+        f'<td dth="Likes">{views // rng.randint(20, 200):,}</td>\n'
+        f'<td dth="Dislikes">{rng.randint(0, 2000):,}</td>\n'
+        f'<td dth="Uploaded">{rng.randint(2012, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}</td>\n'
+        f'<td dth="Auto-Generated">{_flags(rng)}</td>\n'
+        f'<td dth="Subtitles">{_flags(rng)}</td>\n</tr>'
+    )
+
+
+def results_page(query: str, page: int, channel_id: str = None) -> str:
+    """A filmot-like unlistedSearch page; past ``max_pages`` it has no results table."""
+    head = '<!DOCTYPE html><html><head><title>Filmot Unlisted Search</title></head><body><div class="container">'
+    tail = '</div></body></html>'
+    if page > config.max_pages:
+        return f'{head}<div class="alert alert-info">No results found</div>{tail}'
+    rng = _rng(query, channel_id, page)
+    first = (page - 1) * config.rows_per_page + 1
+    rows = "\n".join(_row(rng, position, channel_id) for position in range(first, first + config.rows_per_page))
+    return (
+        f'{head}<table class="table border border-primary table-striped resp-tbl"><thead><tr><th>#</th>'
+        '<th>Title</th><th>Channel</th><th>Category</th><th>Duration</th><th>Views</th><th>Likes</th>'
+        '<th>Dislikes</th><th>Uploaded</th><th>Auto-Generated</th><th>Subtitles</th></tr></thead>'
+        f'<tbody>\n{rows}\n</tbody></table>{tail}'
+    )
+
+
+def search_list(query: str, max_results: int) -> dict:
+    rng = _rng("search", query)
+    items = []
+    for position in range(max_results):
+        video_id = _video_id(rng)
+        published = f"{rng.randint(2015, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z"
+        items.append({
+            "kind": "youtube#searchResult",
+            "id": {"kind": "youtube#video", "videoId": video_id},
+            "snippet": {
+                "publishedAt": published,
+                "channelId": _channel_id(rng),
+                "title": f"{rng.choice(BRANDS)} {rng.choice(KINDS)} #{position + 1}",
+                "description": f"{query} advertisement",
+                "thumbnails": {"default": {"url": f"https://i.ytimg.com/vi/{video_id}/default.jpg", "width": 120, "height": 90}},
+                "channelTitle": f"{rng.choice(BRANDS)} Channel",
+                "liveBroadcastContent": "none",
+                "publishTime": published
+            }
+        })
+    return {
+        "kind": "youtube#searchListResponse",
+        "pageInfo": {"totalResults": 1000000, "resultsPerPage": max_results},
+        "items": items
+    }
+
+
+def videos_list(ids) -> dict:
+    items = []
+    for video_id in ids:
+        rng = _rng("video", video_id)
+        views = rng.randint(100, 5_000_000)
+        items.append({
+            "kind": "youtube#video",
+            "id": video_id,
+            "statistics": {
+                "viewCount": str(views),
+                "likeCount": str(views // rng.randint(20, 200)),
+                "favoriteCount": "0",
+                "commentCount": str(rng.randint(0, 3000))
+            }
+        })
+    return {"kind": "youtube#videoListResponse", "pageInfo": {"totalResults": len(items), "resultsPerPage": 50}, "items": items}
+
+
+async def _delay():
+    latency = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+    if latency > 0:
+        await asyncio.sleep(latency / 1000)
+
+
+def _youtube_error(code: int, reason: str) -> JSONResponse:
+    return JSONResponse(status_code=code, content={"error": {"code": code, "message": reason, "errors": [{"reason": reason}]}})
+
+
+@app.get("/unlistedSearch")
+async def unlisted_search(request: Request):
+    await _delay()
+    if random.random() < config.error_rate:
+        return HTMLResponse("Internal Server Error", status_code=500)
+    if random.random() < config.forbidden_rate:
+        return HTMLResponse("Forbidden", status_code=403)
+    params = request.query_params
+    query = json.dumps(sorted((key, value) for key, value in params.items() if key != "page"))
+    return HTMLResponse(results_page(query, int(params.get("page", 1)), params.get("channelID")))
+
+
+@app.get("/youtube/v3/search")
+async def youtube_search(request: Request):
+    await _delay()
+    if random.random() < config.error_rate:
+        return _youtube_error(500, "backendError")
+    params = request.query_params
+    return search_list(params.get("q", ""), min(50, int(params.get("maxResults", 5))))
+
+
+@app.get("/youtube/v3/videos")
+async def youtube_videos(request: Request):
+    await _delay()
+    if random.random() < config.error_rate:
+        return _youtube_error(500, "backendError")
+    ids = [video_id for video_id in request.query_params.get("id", "").split(",") if video_id]
+    return videos_list(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean added latency per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform +/- jitter around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of responses that are 500s")
+    parser.add_argument("--forbidden-rate", type=float, default=0.0, help="share of filmot responses that are 403s")
+    parser.add_argument("--rows-per-page", type=int, default=50)
+    parser.add_argument("--max-pages", type=int, default=10, help="filmot pages with results per query")
+    args = parser.parse_args()
+
+    config.latency_ms = args.latency_ms
+    config.jitter_ms = args.jitter_ms
+    config.error_rate = args.error_rate
+    config.forbidden_rate = args.forbidden_rate
+    config.rows_per_page = args.rows_per_page
+    config.max_pages = args.max_pages
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
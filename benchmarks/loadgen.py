@@ -0,0 +1,149 @@
+"""Open-loop load generator for the API and the Django search view.
+
+Sends requests at a fixed target rate, whatever the latency of earlier
+requests, so queueing shows up as latency instead of a lower send rate.
+Reports throughput, p50/p95/p99 latency and error rate per target.
+
+Usage (API and Django pointed at benchmarks.fake_upstream):
+    python -m benchmarks.loadgen --rps 50 --duration 30 \\
+        --target unlisted --target videos --target django \\
+        --django-user loadtest --django-password secret
+
+Targets:
+    unlisted   GET {api}/api/search-unlisted?keyword=...
+    videos     GET {api}/api/search-videos?keyword=...
+    django     GET {django}/search/?keyword=...  (logs in first)
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+WORDS = ["shoes", "coffee", "phone", "car", "skincare", "laptop", "pizza", "headphones", "watch", "game"]
+
+
+def percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class Results:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, target: str, latency: float, status: str):
+        self.latencies[target].append(latency)
+        self.statuses[target][status] += 1
+
+    def report(self, duration: float):
+        print(f"{'target':10} {'sent':>7} {'ok/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}  statuses")
+        for target, latencies in sorted(self.latencies.items()):
+            statuses = self.statuses[target]
+            ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+            samples = sorted(latencies)
+            error_rate = 1 - ok / len(samples)
+            breakdown = " ".join(f"{status}:{count}" for status, count in sorted(statuses.items()))
+            print(
+                f"{target:10} {len(samples):7} {ok / duration:8.1f} {percentile(samples, 0.50) * 1000:9.1f} "
+                f"{percentile(samples, 0.95) * 1000:9.1f} {percentile(samples, 0.99) * 1000:9.1f} "
+                f"{error_rate:8.1%}  {breakdown}"
+            )
+
+
+async def django_login(client: httpx.AsyncClient, username: str, password: str):
+    """Log in through the Django login form so search/ is reachable."""
+    await client.get("/login/")
+    response = await client.post(
+        "/login/",
+        data={"username": username, "password": password, "csrfmiddlewaretoken": client.cookies.get("csrftoken", "")},
+        headers={"Referer": f"{client.base_url}/login/"}
+    )
+    if "sessionid" not in client.cookies:
+        raise SystemExit(f"Django login failed (status {response.status_code})")
+
+
+async def api_token(client: httpx.AsyncClient) -> str:
+    response = await client.post("/api/auth/token")
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def request_for(target: str, keyword: str):
+    if target == "unlisted":
+        return "api", "/api/search-unlisted", {"keyword": keyword}
+    if target == "videos":
+        return "api", "/api/search-videos", {"keyword": keyword}
+    return "django", "/search/", {"keyword": keyword}
+
+
+async def send(clients, results: Results, target: str, keyword: str):
+    client_name, path, params = request_for(target, keyword)
+    start = time.perf_counter()
+    try:
+        response = await clients[client_name].get(path, params=params)
+        status = str(response.status_code)
+    except httpx.TimeoutException:
+        status = "timeout"
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.add(target, time.perf_counter() - start, status)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    timeout = httpx.Timeout(args.timeout)
+    keywords = [f"{random.choice(WORDS)} {i}" for i in range(args.keywords)]
+    results = Results()
+
+    async with httpx.AsyncClient(base_url=args.api, limits=limits, timeout=timeout) as api, \
+            httpx.AsyncClient(base_url=args.django, limits=limits, timeout=timeout, follow_redirects=False) as django:
+        if not args.no_auth:
+            api.headers["X-API-Key"] = await api_token(api)
+        if "django" in args.target:
+            await django_login(django, args.django_user, args.django_password)
+        clients = {"api": api, "django": django}
+
+        interval = 1 / args.rps
+        tasks = []
+        started = time.perf_counter()
+        for i in range(int(args.rps * args.duration)):
+            # Fixed schedule: sleep until this request's slot, never wait for responses
+            delay = started + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            target = args.target[i % len(args.target)]
+            tasks.append(asyncio.create_task(send(clients, results, target, random.choice(keywords))))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    print(f"target rate {args.rps}/s for {args.duration}s, {args.keywords} distinct keywords, ran {elapsed:.1f}s")
+    results.report(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api", default="http://127.0.0.1:8000", help="Video Ads API base URL")
+    parser.add_argument("--django", default="http://127.0.0.1:8001", help="Django site base URL")
+    parser.add_argument("--target", action="append", choices=["unlisted", "videos", "django"],
+                        help="repeat to mix targets round-robin (default: unlisted)")
+    parser.add_argument("--rps", type=float, default=10.0, help="target requests per second, all targets combined")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to send for")
+    parser.add_argument("--keywords", type=int, default=20, help="distinct search keywords (controls cache hits)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--no-auth", action="store_true", help="do not fetch an API token first")
+    parser.add_argument("--django-user", default="loadtest")
+    parser.add_argument("--django-password", default="loadtest")
+    args = parser.parse_args()
+    args.target = args.target or ["unlisted"]
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Synthetic upstream responses for offline benchmarks.
+
+The fixtures are generated, not captured; see benchmarks/fixtures/README.md.
+
+filmot pages are served through an httpx.MockTransport and YouTube Data API
+responses through an httplib2-compatible object, so the real client code
+paths run without any network access.
+"""
+import json
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import httplib2
+import httpx
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FILMOT_FIXTURES = FIXTURES / "filmot"
+YOUTUBE_FIXTURES = FIXTURES / "youtube"
+
+
+def load_filmot_pages():
+    """unlistedSearch result pages in page order, plus the channel and empty pages."""
+    return {
+        "search": [
+            (FILMOT_FIXTURES / "unlisted_search_page1.html").read_text(encoding="utf-8"),
+            (FILMOT_FIXTURES / "unlisted_search_page2.html").read_text(encoding="utf-8")
+        ],
+        "channel": (FILMOT_FIXTURES / "channel_page1.html").read_text(encoding="utf-8"),
+        "empty": (FILMOT_FIXTURES / "no_results.html").read_text(encoding="utf-8")
+    }
+
+
+def filmot_response(pages, params) -> tuple:
+    """Status and body filmot would send for an unlistedSearch query."""
+    page = int(params.get("page", "1") or 1)
+    if params.get("channelID"):
+        return 200, pages["channel"] if page == 1 else pages["empty"]
+    if 1 <= page <= len(pages["search"]):
+        return 200, pages["search"][page - 1]
+    return 200, pages["empty"]
+
+
+def filmot_transport() -> httpx.MockTransport:
+    """Serve recorded filmot pages to an httpx client."""
+    pages = load_filmot_pages()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, body = filmot_response(pages, dict(request.url.params))
+        return httpx.Response(status, text=body, headers={"Content-Type": "text/html; charset=utf-8"})
+
+    return httpx.MockTransport(handler)
+
+
+def load_youtube_responses():
+    return {
+        "search": (YOUTUBE_FIXTURES / "search_list.json").read_bytes(),
+        "videos": json.loads((YOUTUBE_FIXTURES / "videos_list.json").read_text(encoding="utf-8"))
+    }
+
+
+def youtube_response(responses, path: str, params) -> tuple:
+    """Status and JSON body the YouTube Data API would send for ``path``."""
+    if path.endswith("/search"):
+        return 200, responses["search"]
+    if path.endswith("/videos"):
+        ids = set(",".join(params.get("id", [])).split(","))
+        videos = responses["videos"]
+        items = [item for item in videos["items"] if item["id"] in ids]
+        return 200, json.dumps({**videos, "items": items}).encode()
+    return 404, b'{"error": {"code": 404, "message": "Not found"}}'
+
+
+class RecordedHttp:
+    """Stand-in for httplib2.Http that answers from the recorded JSON."""
+
+    def __init__(self, responses=None):
+        self.responses = responses or load_youtube_responses()
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=None, connection_type=None):
+        url = urlparse(uri)
+        status, content = youtube_response(self.responses, url.path, parse_qs(url.query))
+        return httplib2.Response({"status": str(status), "content-type": "application/json"}), content
@@ -0,0 +1,205 @@
+"""Offline benchmark suite with a stored baseline.
+
+Replays synthetic filmot pages and YouTube Data API responses through the
+row extractor, the duration parser, YouTubeService.search_videos and the
+/api/search-unlisted route. It reports throughput and p50/p95 latency per
+case and exits non-zero when a case regresses past benchmarks/baseline.json
+by more than the tolerance. No network access is needed.
+
+Usage:
+    python -m benchmarks.suite                     # run and compare
+    python -m benchmarks.suite --update-baseline   # record a new baseline
+    python -m benchmarks.suite --only route --tolerance 0.5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("YOUTUBE_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+# Keep caches, rate limits and quota in memory so runs leave no files behind
+os.environ.setdefault("SHARED_STATE_BACKEND", "memory")
+os.environ.setdefault("VIDEO_INDEX_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-index-"), "video_index.sqlite3"))
+
+import httpx  # noqa: E402
+
+from app.services import youtube_client, youtube_service  # noqa: E402
+from app.services.filmot_parser import parse_duration_to_seconds, parse_result_rows  # noqa: E402
+from app.services.quota import QuotaLedger  # noqa: E402
+from app.services.unlisted_ads import UnlistedVideoFinder  # noqa: E402
+from app.utils.shared_state import MemoryState  # noqa: E402
+from benchmarks.recorded import RecordedHttp, filmot_transport, load_filmot_pages  # noqa: E402
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p95_us": percentile(samples, 0.95) * 1e6
+    }
+
+
+def time_sync(op, args_list, warmup=10):
+    for args in args_list[:warmup]:
+        op(*args)
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        op(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def time_async(op, iterations, warmup=3):
+    for _ in range(warmup):
+        await op()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await op()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_extract_video_data(scale):
+    finder = UnlistedVideoFinder()
+    rows = [row for html in load_filmot_pages()["search"] for row in parse_result_rows(html)]
+    finder.parse_executor.shutdown()
+    return time_sync(finder._extract_video_data, [(row,) for row in rows] * (10 * scale))
+
+
+def bench_parse_duration(scale):
+    finder = UnlistedVideoFinder()
+    finder.parse_executor.shutdown()
+    durations = [
+        video["duration"]
+        for html in load_filmot_pages()["search"]
+        for video in map(finder._extract_video_data, parse_result_rows(html))
+        if video
+    ]
+    return time_sync(finder._parse_duration_to_seconds, [(duration,) for duration in durations] * (200 * scale))
+
+
+def bench_parse_duration_uncached(scale):
+    durations = [f"{h}h {m}m {s}s" if h else f"{m}m {s}s" for h in range(3) for m in range(60) for s in range(0, 60, 7)]
+    return time_sync(parse_duration_to_seconds.__wrapped__, [(duration,) for duration in durations] * scale)
+
+
+def bench_youtube_search(scale):
+    youtube_client.set_http_factory(RecordedHttp)
+    # A private ledger with a huge budget, so the run never degrades
+    youtube_service.quota_ledger = QuotaLedger(state=MemoryState(), daily_quota=10 ** 12, reserve=0)
+    service = youtube_service.YouTubeService()
+
+    async def op():
+        youtube_service._search_cache.clear()
+        videos = await service.search_videos(keyword="running shoes")
+        assert len(videos) == 50, len(videos)
+
+    try:
+        return asyncio.run(time_async(op, 30 * scale))
+    finally:
+        youtube_client.shutdown()
+        youtube_client.set_http_factory(None)
+
+
+def bench_route(scale, cached, source="remote"):
+    from app.api import routes
+    from app.main import app
+
+    routes.unlisted_finder._transport = filmot_transport()
+    params = {"keyword": "running shoes", "source": source}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            if source == "local":
+                # Fill the index the way live searches do, then query all of it
+                await client.get("/api/search-unlisted", params={"keyword": "running shoes"})
+                del params["keyword"]  # the fixture titles do not contain it
+
+            async def op():
+                if not cached:
+                    routes.search_cache.clear()
+                response = await client.get("/api/search-unlisted", params=params)
+                assert response.status_code == 200, response.text
+            try:
+                return await time_async(op, (200 if cached else 40) * scale)
+            finally:
+                await routes.unlisted_finder.aclose()
+
+    return asyncio.run(run())
+
+
+CASES = {
+    "extract_video_data": bench_extract_video_data,
+    "parse_duration_to_seconds": bench_parse_duration,
+    "parse_duration_to_seconds_uncached": bench_parse_duration_uncached,
+    "youtube_search_videos": bench_youtube_search,
+    "route_search_unlisted": lambda scale: bench_route(scale, cached=False),
+    "route_search_unlisted_cached": lambda scale: bench_route(scale, cached=True),
+    "route_search_unlisted_local": lambda scale: bench_route(scale, cached=True, source="local")
+}
+
+
+def compare(name, result, baseline, tolerance):
+    """Return the regressions of ``result`` against the baseline entry."""
+    problems = []
+    if result["ops_per_sec"] < baseline["ops_per_sec"] / (1 + tolerance):
+        problems.append(f"throughput {result['ops_per_sec']:.0f}/s < baseline {baseline['ops_per_sec']:.0f}/s")
+    if result["p95_us"] > baseline["p95_us"] * (1 + tolerance):
+        problems.append(f"p95 {result['p95_us']:.1f}us > baseline {baseline['p95_us']:.1f}us")
+    return [f"{name}: {problem}" for problem in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown, 0.3 = 30%%")
+    parser.add_argument("--scale", type=int, default=1, help="multiply iteration counts")
+    parser.add_argument("--only", help="run cases whose name contains this")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results = {}
+    regressions = []
+    print(f"{'case':38} {'ops/sec':>12} {'p50':>12} {'p95':>12}")
+    for name, case in CASES.items():
+        if args.only and args.only not in name:
+            continue
+        result = results[name] = summarize(case(args.scale))
+        print(f"{name:38} {result['ops_per_sec']:12.0f} {result['p50_us']:10.1f}us {result['p95_us']:10.1f}us")
+        if name in baseline and not args.update_baseline:
+            regressions.extend(compare(name, result, baseline[name], args.tolerance))
+
+    if args.update_baseline:
+        rounded = {name: {key: round(value, 2) for key, value in result.items()} for name, result in results.items()}
+        args.baseline.write_text(json.dumps({**baseline, **rounded}, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions against baseline" if baseline else "\nNo baseline yet; run with --update-baseline")
+
+
+if __name__ == "__main__":
+    main()
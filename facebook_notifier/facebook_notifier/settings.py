@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
+import os
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -30,6 +31,9 @@ ALLOWED_HOSTS = ["13.51.45.176", "localhost", "127.0.0.1"]
 
 LOGIN_URL = '/login/'  # Redirects users to /login/ when login is required
 
+# Video Ads API the search views call; override to point at another instance
+FASTAPI_BASE_URL = os.environ.get('FASTAPI_BASE_URL', 'http://localhost:8000')
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -1,7 +1,8 @@
 from django.shortcuts import render, redirect,get_object_or_404
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.core.paginator import Paginator
 from .models import FacebookNotification, Video, VideoCategory
 import re
 from django.http import JsonResponse
@@ -18,7 +19,10 @@ from rest_framework.response import Response
 from rest_framework import status
 
 # FastAPI endpoint base URL
-FASTAPI_BASE_URL = "http://localhost:8000"  # Adjust port if needed
+FASTAPI_BASE_URL = settings.FASTAPI_BASE_URL
+
+# Videos per search results page (3x3 grid)
+SEARCH_PAGE_SIZE = 9
 
 @csrf_exempt  # Disable CSRF for API
 def all_data(request):
@@ -223,6 +227,53 @@ def search_unlisted(request):
             'message': f'Failed to connect to FastAPI: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class RemoteResultPage:
+    """One fetched page of a server-side result set, sized like the whole set.
+
+    Lets Django's Paginator compute page numbers from the total while only
+    the requested page is actually downloaded.
+    """
+
+    def __init__(self, items, offset, total):
+        self.items = items
+        self.offset = offset
+        self.total = total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) and index.start == self.offset:
+            return self.items
+        return []
+
+
+def fetch_unlisted_page(request, params, page_number):
+    """Fetch one page of unlisted search results from FastAPI.
+
+    The cursor of the server-side result set is kept in the session, so
+    moving between pages slices the stored results instead of searching
+    filmot again.
+    """
+    session_state = request.session.get('unlisted_search') or {}
+    cursor = session_state.get('cursor') if session_state.get('params') == params else None
+
+    page_params = {'limit': SEARCH_PAGE_SIZE, 'offset': (page_number - 1) * SEARCH_PAGE_SIZE}
+    if cursor:
+        page_params['cursor'] = cursor
+    else:
+        page_params.update(params)
+
+    response = requests.get(f"{FASTAPI_BASE_URL}/api/search-unlisted", params=page_params)
+    if response.status_code == 410 and cursor:
+        # Result set expired on the server; run the search again
+        request.session.pop('unlisted_search', None)
+        return fetch_unlisted_page(request, params, page_number)
+
+    if response.status_code == 200:
+        request.session['unlisted_search'] = {'params': params, 'cursor': response.json().get('cursor')}
+    return response
+
 def format_number(number):
     """Format large numbers to K, M, B format"""
     if not isinstance(number, (int, float)):
@@ -275,25 +326,32 @@ def search_videos(request):
                 # Prepare query parameters
                 params = {k: v for k, v in context['search_params'].items() if v}
                 
-                # Make request to FastAPI search endpoint
-                response = requests.get(f"{FASTAPI_BASE_URL}/api/search-unlisted", params=params)
+                try:
+                    page = max(1, int(request.GET.get('page', 1)))
+                except (TypeError, ValueError):
+                    page = 1
+
+                # Fetch only the requested page from the FastAPI search endpoint
+                response = fetch_unlisted_page(request, params, page)
                 if response.status_code == 200:
                     data = response.json()
-                    videos_list = data.get('videos', [])
-                    
+                    last_page = max(1, -(-data.get('total', 0) // SEARCH_PAGE_SIZE))
+                    if page > last_page:
+                        page = last_page
+                        response = fetch_unlisted_page(request, params, page)
+                        data = response.json()
+
                     # Set up pagination
-                    page = request.GET.get('page', 1)
-                    paginator = Paginator(videos_list, 9)  # Show 9 videos per page (3x3 grid)
-                    
-                    try:
-                        videos = paginator.page(page)
-                    except PageNotAnInteger:
-                        videos = paginator.page(1)
-                    except EmptyPage:
-                        videos = paginator.page(paginator.num_pages)
+                    remote_page = RemoteResultPage(
+                        data.get('videos', []),
+                        (page - 1) * SEARCH_PAGE_SIZE,
+                        data.get('total', 0)
+                    )
+                    paginator = Paginator(remote_page, SEARCH_PAGE_SIZE)  # Show 9 videos per page (3x3 grid)
+                    videos = paginator.page(page)
                     
                     context['videos'] = videos
-                    print(f"Received {len(videos_list)} videos from FastAPI, showing page {page}")
+                    print(f"Received {data.get('count', 0)} of {data.get('total', 0)} videos from FastAPI, showing page {page}")
                 else:
                     error_msg = f'Search API returned status code {response.status_code}'
                     print(error_msg)